@@ -4,15 +4,121 @@ Content Summarization Module for Token Optimization
 Intelligently summarizes and compresses content to fit within token limits
 """
 
+import os
 import re
+import math
+import multiprocessing
+import heapq
 import logging
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from dataclasses import dataclass, field, replace
 from enum import Enum
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import hashlib
 
+# Optional xxHash for content fingerprints (non-cryptographic, much faster than blake2b)
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
 logger = logging.getLogger("autopicker.content_summarizer")
 
+# Texts shorter than this are cheaper to re-tokenize than to fingerprint and cache
+TOKEN_CACHE_MIN_LENGTH = 512
+
+# Batches with at least this much text are worth the cost of a process pool
+PARALLEL_BATCH_MIN_CHARS = 500_000
+
+# Precompiled patterns for the per-sentence hot paths
+# A separator match may only start at the beginning of a punctuation run, so a
+# long run that isn't followed by whitespace is rejected once, not once per character
+_SENT_RE = re.compile(r'(?<![.!?])[.!?]+\s+')
+_WHITESPACE_RE = re.compile(r'\s')
+
+# Unpunctuated runs longer than this are broken at whitespace into several sentences
+MAX_SENTENCE_CHARS = 2000
+_DIGIT_RE = re.compile(r'\d+')
+_WORD_RE = re.compile(r'\b[a-zA-Z]{4,}\b')
+
+# Common stopwords for filtering
+STOPWORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those',
+    'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'
+})
+
+# Importance indicators
+IMPORTANCE_HIGH = frozenset({
+    'important', 'critical', 'essential', 'key', 'main', 'primary', 
+    'significant', 'major', 'fundamental', 'core', 'vital', 'crucial'
+})
+IMPORTANCE_MEDIUM = frozenset({
+    'notable', 'relevant', 'useful', 'valuable', 'interesting', 
+    'worth', 'consider', 'note', 'observe', 'mention'
+})
+IMPORTANCE_STRUCTURAL = frozenset({
+    'first', 'second', 'third', 'finally', 'conclusion', 
+    'summary', 'overview', 'introduction', 'background'
+})
+IMPORTANCE_INDICATORS = {
+    'high': IMPORTANCE_HIGH,
+    'medium': IMPORTANCE_MEDIUM,
+    'structural': IMPORTANCE_STRUCTURAL
+}
+
+# Flattened (keyword, weight) table so a sentence is scored in one pass
+_IMPORTANCE_WEIGHTS = (
+    tuple((keyword, 3.0) for keyword in IMPORTANCE_HIGH)
+    + tuple((keyword, 2.0) for keyword in IMPORTANCE_MEDIUM)
+    + tuple((keyword, 1.5) for keyword in IMPORTANCE_STRUCTURAL)
+)
+
+
+def _lowercase_document(text: str) -> Optional[str]:
+    """Lowercase text in one call, or None if that shifts offsets so spans can't be sliced from it"""
+    lowered = text.lower()
+    return lowered if len(lowered) == len(text) else None
+
+
+def _normalize_sentence(text: str) -> str:
+    """Case- and whitespace-insensitive form of a sentence for duplicate detection"""
+    return " ".join(text.lower().split())
+
+
+def _fingerprint(text: str) -> bytes:
+    """Content fingerprint used as a cache key"""
+    data = text.encode("utf-8", "surrogatepass")
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_128_digest(data)
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class _BoundedCache(OrderedDict):
+    """Small LRU mapping that evicts the least recently used entry past maxsize"""
+    
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+    
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+    
+    def put(self, key, value):
+        self[key] = value
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
 class SummarizationStrategy(Enum):
     """Different summarization strategies"""
     EXTRACTIVE = "extractive"  # Extract key sentences
@@ -23,7 +129,6 @@ class SummarizationStrategy(Enum):
 @dataclass
 class SummaryResult:
     """Result of content summarization"""
-    original_content: str
     summarized_content: str
     original_tokens: int
     summarized_tokens: int
@@ -31,6 +136,10 @@ class SummaryResult:
     strategy_used: str
     key_points: List[str]
     metadata: Dict[str, Any]
+    # The input is only echoed back when asked for (keep_original); otherwise
+    # callers can match results to inputs by fingerprint
+    original_content: Optional[str] = field(default=None, repr=False)
+    original_content_hash: bytes = b''
 
 class ContentSummarizer:
     """Intelligent content summarization for token optimization"""
@@ -38,24 +147,53 @@ class ContentSummarizer:
     def __init__(self, token_counter):
         self.token_counter = token_counter
         
-        # Common stopwords for filtering
-        self.stopwords = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 
-            'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-            'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-            'should', 'may', 'might', 'can', 'this', 'that', 'these', 'those',
-            'i', 'you', 'he', 'she', 'it', 'we', 'they', 'me', 'him', 'her', 'us', 'them'
-        }
+        # Per-document token start offsets, so every pass over the same content
+        # shares a single tokenizer call
+        self._offsets_cache = _BoundedCache(maxsize=8)
         
-        # Importance indicators
-        self.importance_indicators = {
-            'high': ['important', 'critical', 'essential', 'key', 'main', 'primary', 
-                    'significant', 'major', 'fundamental', 'core', 'vital', 'crucial'],
-            'medium': ['notable', 'relevant', 'useful', 'valuable', 'interesting', 
-                      'worth', 'consider', 'note', 'observe', 'mention'],
-            'structural': ['first', 'second', 'third', 'finally', 'conclusion', 
-                          'summary', 'overview', 'introduction', 'background']
-        }
+        # Token counts for longer texts (documents, summaries) that get re-counted
+        # across strategies and batch passes
+        self._tok_cache = _BoundedCache(maxsize=4096)
+        
+        # Shared immutable tables, built once at import
+        self.stopwords = STOPWORDS
+        self.importance_indicators = IMPORTANCE_INDICATORS
+        self._importance_weights = _IMPORTANCE_WEIGHTS
+        
+        # Finished summaries of content that needed compressing, for retries and
+        # repeated requests over the same input
+        self._summary_cache = _BoundedCache(maxsize=256)
+        
+        # Inverse document frequencies over the current batch, if any, and a
+        # fingerprint of that batch so cached summaries don't leak across corpora
+        self._corpus_idf: Optional[Dict[str, float]] = None
+        self._corpus_key: Optional[bytes] = None
+        self._default_idf = 1.0
+        
+        # Worker pool for large batches, started on first use and kept for the
+        # life of the summarizer (see close())
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+    
+    def close(self):
+        """Shut down the batch worker pool, if one was started"""
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+    
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        """Shared worker pool for parallel batches, created on first use"""
+        if self._process_pool is None:
+            # Workers come from a fork server (or are spawned) rather than forked from
+            # this process, which may have logging and event loop threads running
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=context,
+                initializer=_init_summary_worker,
+                initargs=(self.token_counter,)
+            )
+        return self._process_pool
     
     def summarize_content(
         self,
@@ -63,24 +201,36 @@ class ContentSummarizer:
         target_tokens: int,
         strategy: SummarizationStrategy = SummarizationStrategy.HYBRID,
         model_family: str = "default",
-        context_keywords: Optional[List[str]] = None
+        context_keywords: Optional[List[str]] = None,
+        keep_original: bool = False
     ) -> SummaryResult:
         """Summarize content to fit within target token limit"""
         
-        original_tokens = self.token_counter.count_tokens(content, model_family)
-        
-        if original_tokens <= target_tokens:
-            return SummaryResult(
-                original_content=content,
-                summarized_content=content,
-                original_tokens=original_tokens,
-                summarized_tokens=original_tokens,
-                compression_ratio=1.0,
-                strategy_used="none_needed",
-                key_points=self._extract_key_points(content),
-                metadata={"no_compression_needed": True}
+        content_hash = _fingerprint(content)
+        original_content = content if keep_original else None
+        cache_key = (
+            content_hash, target_tokens, strategy.value, model_family,
+            tuple(context_keywords or ()), self._corpus_key
+        )
+        cached = self._summary_cache.get(cache_key)
+        if cached is not None:
+            return replace(
+                cached,
+                original_content=original_content,
+                key_points=list(cached.key_points),
+                metadata={**cached.metadata, "cache_hit": True}
             )
         
+        # Content this much longer than the target (over ~10 characters per token)
+        # needs compressing anyway, so its count is taken afterwards from the
+        # tokenizer pass the strategy makes rather than from a separate one
+        compression_certain = len(content) > target_tokens * 10
+        
+        if not compression_certain:
+            original_tokens = self._count(content, model_family)
+            if original_tokens <= target_tokens:
+                return self._uncompressed_result(content, original_tokens, content_hash, keep_original)
+        
         # Apply summarization strategy
         if strategy == SummarizationStrategy.EXTRACTIVE:
             summarized = self._extractive_summarization(content, target_tokens, model_family, context_keywords)
@@ -91,11 +241,15 @@ class ContentSummarizer:
         else:  # HYBRID
             summarized = self._hybrid_summarization(content, target_tokens, model_family, context_keywords)
         
-        summarized_tokens = self.token_counter.count_tokens(summarized, model_family)
+        if compression_certain:
+            original_tokens = self._count(content, model_family)
+            if original_tokens <= target_tokens:
+                return self._uncompressed_result(content, original_tokens, content_hash, keep_original)
+        
+        summarized_tokens = self._count(summarized, model_family)
         compression_ratio = summarized_tokens / original_tokens if original_tokens > 0 else 1.0
         
-        return SummaryResult(
-            original_content=content,
+        result = SummaryResult(
             summarized_content=summarized,
             original_tokens=original_tokens,
             summarized_tokens=summarized_tokens,
@@ -106,7 +260,35 @@ class ContentSummarizer:
                 "target_tokens": target_tokens,
                 "tokens_saved": original_tokens - summarized_tokens,
                 "compression_percentage": round((1 - compression_ratio) * 100, 1)
-            }
+            },
+            original_content_hash=content_hash
+        )
+        self._summary_cache.put(cache_key, result)
+        return replace(
+            result,
+            original_content=original_content,
+            key_points=list(result.key_points),
+            metadata=dict(result.metadata)
+        )
+    
+    def _uncompressed_result(
+        self,
+        content: str,
+        original_tokens: int,
+        content_hash: bytes,
+        keep_original: bool
+    ) -> SummaryResult:
+        """Result for content that already fits its target"""
+        return SummaryResult(
+            summarized_content=content,
+            original_tokens=original_tokens,
+            summarized_tokens=original_tokens,
+            compression_ratio=1.0,
+            strategy_used="none_needed",
+            key_points=self._extract_key_points(content),
+            metadata={"no_compression_needed": True},
+            original_content=content if keep_original else None,
+            original_content_hash=content_hash
         )
     
     def _extractive_summarization(
@@ -118,79 +300,87 @@ class ContentSummarizer:
     ) -> str:
         """Extract the most important sentences"""
         
-        sentences = self._split_into_sentences(content)
-        if not sentences:
+        spans, span_tokens = self._tokenize_with_offsets(content, model_family)
+        if not spans:
             return content[:target_tokens * 4]  # Rough character limit fallback
+        context_lower = [keyword.lower() for keyword in context_keywords] if context_keywords else None
         
-        # Score sentences by importance
-        scored_sentences = []
-        for sentence in sentences:
-            score = self._score_sentence_importance(sentence, context_keywords)
-            tokens = self.token_counter.count_tokens(sentence, model_family)
-            scored_sentences.append((sentence, score, tokens))
-        
-        # Sort by importance score
-        scored_sentences.sort(key=lambda x: x[1], reverse=True)
+        # Score every sentence in one pass, then rank positions by score
+        scores = self._score_sentences(content, spans, context_lower)
+        ranked = sorted(range(len(spans)), key=scores.__getitem__, reverse=True)
         
         # Select sentences until we hit token limit
-        selected_sentences = []
+        selected = []
         current_tokens = 0
         
-        for sentence, score, tokens in scored_sentences:
+        for i in ranked:
+            tokens = span_tokens[i]
             if current_tokens + tokens <= target_tokens:
-                selected_sentences.append((sentence, score))
+                selected.append(i)
                 current_tokens += tokens
             else:
                 break
         
-        # Sort selected sentences by original order
-        original_order = []
-        for sentence, _ in selected_sentences:
-            try:
-                idx = sentences.index(sentence)
-                original_order.append((idx, sentence))
-            except ValueError:
-                continue
-        
-        original_order.sort(key=lambda x: x[0])
+        # Restore original order
+        selected.sort()
         
-        return " ".join([sentence for _, sentence in original_order])
+        return " ".join([content[spans[i][0]:spans[i][1]] for i in selected])
     
     def _structural_summarization(self, content: str, target_tokens: int, model_family: str) -> str:
         """Preserve document structure while compressing content"""
         
         # Identify sections/paragraphs
-        paragraphs = content.split('\n\n')
-        if len(paragraphs) == 1:
-            paragraphs = content.split('\n')
+        spans = self._paragraph_spans(content, '\n\n')
+        if len(spans) == 1:
+            spans = self._paragraph_spans(content, '\n')
         
         # Calculate target tokens per section
-        target_per_section = target_tokens // len(paragraphs) if paragraphs else target_tokens
+        target_per_section = target_tokens // len(spans) if spans else target_tokens
+        
+        # Paragraph token counts come from the document's single tokenizer pass
+        spans = [(start, end) for start, end in spans if content[start:end].strip()]
+        span_tokens = self._span_token_counts(content, spans, model_family)
         
         compressed_sections = []
         remaining_tokens = target_tokens
+        separator_tokens = self._count('\n\n', model_family)
         
-        for paragraph in paragraphs:
-            if not paragraph.strip():
-                continue
-                
-            para_tokens = self.token_counter.count_tokens(paragraph, model_family)
+        for (start, end), para_tokens in zip(spans, span_tokens):
+            paragraph = content[start:end]
             
-            if para_tokens <= target_per_section or remaining_tokens >= para_tokens:
+            # The separator joining this section to the previous one is part of the budget too
+            section_budget = remaining_tokens - separator_tokens if compressed_sections else remaining_tokens
+            if section_budget <= 0:
+                break
+            
+            if para_tokens <= section_budget:
                 # Keep paragraph as is
-                compressed_sections.append(paragraph)
-                remaining_tokens -= para_tokens
+                section, section_tokens = paragraph, para_tokens
             else:
                 # Compress paragraph
-                compressed = self._compress_paragraph(paragraph, min(target_per_section, remaining_tokens), model_family)
-                compressed_sections.append(compressed)
-                remaining_tokens -= self.token_counter.count_tokens(compressed, model_family)
+                section = self._compress_paragraph(paragraph, min(target_per_section, section_budget), model_family)
+                section_tokens = self._count(section, model_family)
+                if not section.strip() or section_tokens > section_budget:
+                    # Nothing of this paragraph fits; a later one still might
+                    continue
             
-            if remaining_tokens <= 0:
-                break
+            compressed_sections.append(section)
+            remaining_tokens = section_budget - section_tokens
         
         return '\n\n'.join(compressed_sections)
     
+    def _paragraph_spans(self, content: str, separator: str) -> List[Tuple[int, int]]:
+        """(start, end) offsets of the pieces content.split(separator) would return"""
+        spans = []
+        start = 0
+        end = content.find(separator)
+        while end != -1:
+            spans.append((start, end))
+            start = end + len(separator)
+            end = content.find(separator, start)
+        spans.append((start, len(content)))
+        return spans
+    
     def _keyword_focused_summarization(
         self, 
         content: str, 
@@ -200,39 +390,59 @@ class ContentSummarizer:
     ) -> str:
         """Focus on content related to specific keywords"""
         
+        kept_spans = self._keyword_focused_spans(content, target_tokens, model_family, context_keywords)
+        return " ".join(content[start:end] for start, end in kept_spans)
+    
+    def _keyword_focused_spans(
+        self, 
+        content: str, 
+        target_tokens: int, 
+        model_family: str,
+        context_keywords: Optional[List[str]] = None
+    ) -> List[Tuple[int, int]]:
+        """Sentence spans picked by keyword-focused summarization, in pick order"""
+        
         if not context_keywords:
             # Extract keywords from content
             context_keywords = self._extract_keywords(content)
         
-        sentences = self._split_into_sentences(content)
-        keyword_sentences = []
+        spans, span_tokens = self._tokenize_with_offsets(content, model_family)
+        context_lower = [keyword.lower() for keyword in context_keywords]
+        content_lower = _lowercase_document(content)
+        kept_spans = []
+        picked_indices = set()
         current_tokens = 0
         
         # Prioritize sentences containing keywords
-        for sentence in sentences:
-            sentence_keywords = sum(1 for keyword in context_keywords 
-                                  if keyword.lower() in sentence.lower())
+        for i, ((start, end), tokens) in enumerate(zip(spans, span_tokens)):
+            if content_lower is not None:
+                sentence_lower = content_lower[start:end]
+            else:
+                sentence_lower = content[start:end].lower()
+            sentence_keywords = sum(1 for keyword in context_lower if keyword in sentence_lower)
             
             if sentence_keywords > 0:
-                tokens = self.token_counter.count_tokens(sentence, model_family)
                 if current_tokens + tokens <= target_tokens:
-                    keyword_sentences.append(sentence)
+                    kept_spans.append((start, end))
+                    picked_indices.add(i)
                     current_tokens += tokens
                 else:
                     break
         
         # If we have remaining space, add other important sentences
         if current_tokens < target_tokens * 0.9:  # 90% threshold
-            remaining_sentences = [s for s in sentences if s not in keyword_sentences]
-            for sentence in remaining_sentences:
-                tokens = self.token_counter.count_tokens(sentence, model_family)
+            remaining_spans = [
+                (span, tokens) for i, (span, tokens) in enumerate(zip(spans, span_tokens))
+                if i not in picked_indices
+            ]
+            for span, tokens in remaining_spans:
                 if current_tokens + tokens <= target_tokens:
-                    keyword_sentences.append(sentence)
+                    kept_spans.append(span)
                     current_tokens += tokens
                 else:
                     break
         
-        return " ".join(keyword_sentences)
+        return kept_spans
     
     def _hybrid_summarization(
         self, 
@@ -245,16 +455,23 @@ class ContentSummarizer:
         
         # First, try keyword-focused if we have keywords
         if context_keywords:
-            keyword_summary = self._keyword_focused_summarization(
+            kept_spans = self._keyword_focused_spans(
                 content, int(target_tokens * 0.7), model_family, context_keywords
             )
-            remaining_tokens = target_tokens - self.token_counter.count_tokens(keyword_summary, model_family)
+            keyword_summary = " ".join(content[start:end] for start, end in kept_spans)
+            remaining_tokens = target_tokens - self._count(keyword_summary, model_family)
             
             if remaining_tokens > 0:
-                # Add extractive content for remaining space
-                remaining_content = content
-                for sentence in self._split_into_sentences(keyword_summary):
-                    remaining_content = remaining_content.replace(sentence, "")
+                # Add extractive content for remaining space, rebuilt from the
+                # sentences not already used (each with its trailing separator);
+                # repeats of a used sentence elsewhere in the document are dropped too
+                kept = {_normalize_sentence(content[start:end]) for start, end in kept_spans}
+                spans = self._sentence_spans(content)
+                remaining_content = "".join(
+                    content[start:spans[i + 1][0] if i + 1 < len(spans) else len(content)]
+                    for i, (start, end) in enumerate(spans)
+                    if _normalize_sentence(content[start:end]) not in kept
+                )
                 
                 if remaining_content.strip():
                     extractive_summary = self._extractive_summarization(
@@ -270,54 +487,211 @@ class ContentSummarizer:
                 content, int(target_tokens * 0.8), model_family
             )
             
-            structural_tokens = self.token_counter.count_tokens(structural_summary, model_family)
+            structural_tokens = self._count(structural_summary, model_family)
             
-            if structural_tokens < target_tokens:
+            if structural_summary.strip() and structural_tokens < target_tokens:
                 return structural_summary
             else:
                 # Fall back to extractive
                 return self._extractive_summarization(content, target_tokens, model_family)
     
+    def _count(self, text: str, model_family: str) -> int:
+        """Count tokens, memoizing results for longer texts"""
+        if len(text) <= TOKEN_CACHE_MIN_LENGTH:
+            return self.token_counter.count_tokens(text, model_family)
+        
+        key = (_fingerprint(text), model_family)
+        tokens = self._tok_cache.get(key)
+        if tokens is None:
+            # Reuse the token offsets if this text was already tokenized for splitting
+            offsets = self._offsets_cache.get(key)
+            if offsets is not None:
+                tokens = len(offsets)
+            else:
+                tokens = self.token_counter.count_tokens(text, model_family)
+            self._tok_cache.put(key, tokens)
+        return tokens
+    
+    def _precount_files(self, contents: List[str], model_family: str):
+        """Prime the token count cache for several texts at once"""
+        pending = {}
+        for content in contents:
+            if len(content) > TOKEN_CACHE_MIN_LENGTH:
+                key = (_fingerprint(content), model_family)
+                if key not in self._tok_cache:
+                    pending[key] = content
+        if not pending:
+            return
+        
+        texts = list(pending.values())
+        count_batch = getattr(self.token_counter, "count_tokens_batch", None)
+        if count_batch is not None:
+            counts = count_batch(texts, model_family)
+        else:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                counts = list(executor.map(lambda text: self.token_counter.count_tokens(text, model_family), texts))
+        
+        for key, tokens in zip(pending, counts):
+            self._tok_cache.put(key, tokens)
+    
+    def _sentence_spans(self, text: str) -> List[Tuple[int, int]]:
+        """Locate sentences as (start, end) offsets, trimmed of surrounding whitespace"""
+        bounds = []
+        start = 0
+        for match in _SENT_RE.finditer(text):
+            bounds.append((start, match.start()))
+            start = match.end()
+        bounds.append((start, len(text)))
+        
+        spans = []
+        for start, end in bounds:
+            segment = text[start:end]
+            body = segment.strip()
+            if body:
+                start += len(segment) - len(segment.lstrip())
+                if len(body) <= MAX_SENTENCE_CHARS:
+                    spans.append((start, start + len(body)))
+                else:
+                    self._split_long_span(text, start, start + len(body), spans)
+        return spans
+    
+    def _split_long_span(self, text: str, start: int, end: int, spans: List[Tuple[int, int]]):
+        """Break an overlong sentence into pieces of at most MAX_SENTENCE_CHARS at whitespace"""
+        while end - start > MAX_SENTENCE_CHARS:
+            limit = start + MAX_SENTENCE_CHARS
+            cut = text.rfind(' ', start + 1, limit + 1)
+            if cut == -1:
+                match = None
+                for match in _WHITESPACE_RE.finditer(text, start + 1, limit + 1):
+                    pass
+                cut = match.start() if match else limit  # no whitespace at all: hard cut
+            piece = text[start:cut].rstrip()
+            spans.append((start, start + len(piece)))
+            start = cut
+            while start < end and text[start].isspace():
+                start += 1
+        if start < end:
+            spans.append((start, end))
+    
     def _split_into_sentences(self, text: str) -> List[str]:
         """Split text into sentences"""
         # Simple sentence splitting - could be enhanced with NLTK/spaCy
-        sentences = re.split(r'[.!?]+\s+', text)
-        return [s.strip() for s in sentences if s.strip()]
+        return [text[start:end] for start, end in self._sentence_spans(text)]
     
-    def _score_sentence_importance(self, sentence: str, context_keywords: Optional[List[str]] = None) -> float:
-        """Score a sentence's importance"""
-        score = 0.0
-        sentence_lower = sentence.lower()
-        
-        # Length score (moderate length preferred)
-        length_score = min(len(sentence) / 100, 1.0)  # Normalize to 0-1
-        if 50 <= len(sentence) <= 200:  # Sweet spot
-            length_score *= 1.5
-        score += length_score
-        
-        # Importance keywords
-        for level, keywords in self.importance_indicators.items():
-            multiplier = 3.0 if level == 'high' else 2.0 if level == 'medium' else 1.5
-            for keyword in keywords:
-                if keyword in sentence_lower:
-                    score += multiplier
-        
-        # Context keywords
-        if context_keywords:
-            for keyword in context_keywords:
-                if keyword.lower() in sentence_lower:
-                    score += 5.0
+    def _span_token_counts(self, content: str, spans: List[Tuple[int, int]], model_family: str) -> List[int]:
+        """Token counts for ordered, non-overlapping spans of content, from one tokenizer pass over it"""
+        key = (_fingerprint(content), model_family)
+        if key in self._offsets_cache:
+            offsets = self._offsets_cache.get(key)
+        else:
+            offsets = self.token_counter.token_offsets(content, model_family)
+            if offsets is not None:
+                offsets = array('q', offsets)
+            self._offsets_cache.put(key, offsets)
+        
+        if offsets is None:
+            # No tokenizer available - same ~4 characters per token estimate as count_tokens
+            return [(end - start) // 4 for start, end in spans]
+        
+        # A token counts toward every span it overlaps. Spans are trimmed, so a
+        # sentence's leading-space token (" The") starts just before the span and
+        # would be missed by bucketing on start offsets alone
+        return [
+            max(bisect_left(offsets, end) - bisect_right(offsets, start) + 1, 0) if end > start else 0
+            for start, end in spans
+        ]
+    
+    def _tokenize_with_offsets(self, content: str, model_family: str) -> Tuple[List[Tuple[int, int]], List[int]]:
+        """Sentence spans of content along with their token counts"""
+        spans = self._sentence_spans(content)
+        return spans, self._span_token_counts(content, spans, model_family)
+    
+    def _score_sentences(
+        self,
+        content: str,
+        spans: List[Tuple[int, int]],
+        context_keywords: Optional[List[str]] = None
+    ) -> List[float]:
+        """Score the importance of each sentence span (context_keywords are expected lowercased)"""
+        digit_search = _DIGIT_RE.search
+        content_lower = _lowercase_document(content)
+        
+        if content_lower is not None:
+            # Scan the document once per keyword instead of every sentence per keyword
+            importance = self._keyword_span_weights(content_lower, spans, self._importance_weights)
+            context = self._keyword_span_weights(
+                content_lower, spans, [(keyword, 5.0) for keyword in context_keywords or ()]
+            )
+        else:
+            importance = []
+            context = []
+            for start, end in spans:
+                sentence_lower = content[start:end].lower()
+                importance.append(
+                    sum(weight for keyword, weight in self._importance_weights if keyword in sentence_lower)
+                )
+                context.append(
+                    5.0 * sum(1 for keyword in context_keywords if keyword in sentence_lower)
+                    if context_keywords else 0.0
+                )
         
-        # Numbers and specific information
-        if re.search(r'\d+', sentence):
-            score += 1.0
+        scores = []
+        for (start, end), importance_score, context_score in zip(spans, importance, context):
+            length = end - start
+            
+            # Length score (moderate length preferred)
+            score = min(length / 100, 1.0)  # Normalize to 0-1
+            if 50 <= length <= 200:  # Sweet spot
+                score *= 1.5
+            
+            # Importance keywords
+            score += importance_score
+            
+            # Context keywords
+            if context_keywords:
+                score += context_score
+            
+            # Numbers and specific information
+            if digit_search(content, start, end):
+                score += 1.0
+            
+            # Questions (often important)
+            if content[end - 1] == '?':
+                score += 2.0
+            
+            scores.append(score)
         
-        # Questions (often important)
-        if sentence.strip().endswith('?'):
-            score += 2.0
+        return scores
+    
+    def _keyword_span_weights(
+        self,
+        text_lower: str,
+        spans: List[Tuple[int, int]],
+        keyword_weights: Sequence[Tuple[str, float]]
+    ) -> List[float]:
+        """Total weight of the keywords each span contains, from one str.find scan per keyword"""
+        totals = [0.0] * len(spans)
+        starts = [start for start, _ in spans]
+        find = text_lower.find
+        
+        for keyword, weight in keyword_weights:
+            if not keyword:
+                # The empty string is in every sentence
+                totals = [total + weight for total in totals]
+                continue
+            
+            size = len(keyword)
+            pos = find(keyword)
+            while pos != -1:
+                i = bisect_right(starts, pos) - 1
+                if i >= 0 and pos + size <= spans[i][1]:
+                    # Count the keyword once per span, then resume after it
+                    totals[i] += weight
+                    pos = find(keyword, spans[i][1])
+                else:
+                    pos = find(keyword, pos + 1)
         
-        # First and last sentences often important
-        return score
+        return totals
     
     def _compress_paragraph(self, paragraph: str, target_tokens: int, model_family: str) -> str:
         """Compress a single paragraph"""
@@ -331,17 +705,44 @@ class ContentSummarizer:
     
     def _extract_keywords(self, content: str, max_keywords: int = 20) -> List[str]:
         """Extract important keywords from content"""
-        # Simple keyword extraction - could be enhanced with TF-IDF or other methods
-        words = re.findall(r'\b[a-zA-Z]{4,}\b', content.lower())
-        word_freq = {}
-        
-        for word in words:
+        # The pattern is case-agnostic already, so count the words as written and
+        # fold case once per distinct spelling rather than once per occurrence
+        # (and never over a lowercased copy of the whole document)
+        word_freq = Counter()
+        for word, freq in Counter(_WORD_RE.findall(content)).items():
+            word = word.lower()
             if word not in self.stopwords:
-                word_freq[word] = word_freq.get(word, 0) + 1
+                word_freq[word] += freq
+        
+        if self._corpus_idf is not None:
+            # Rank by TF-IDF so words common across the batch give way to
+            # ones specific to this document
+            idf = self._corpus_idf
+            default_idf = self._default_idf
+            return heapq.nlargest(
+                max_keywords, word_freq,
+                key=lambda word: word_freq[word] * idf.get(word, default_idf)
+            )
         
-        # Sort by frequency and return top keywords
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        return [word for word, freq in sorted_words[:max_keywords]]
+        # Top keywords by frequency (most_common(k) is a heap selection, not a full sort)
+        return [word for word, freq in word_freq.most_common(max_keywords)]
+    
+    def _build_corpus_idf(self, contents: List[str]) -> Dict[str, float]:
+        """Smoothed inverse document frequency of each keyword candidate across contents"""
+        doc_freq = Counter()
+        corpus_hash = hashlib.blake2b(digest_size=16)
+        for content in contents:
+            doc_freq.update({word.lower() for word in set(_WORD_RE.findall(content))})
+            corpus_hash.update(_fingerprint(content))
+        
+        n_docs = len(contents)
+        self._corpus_key = corpus_hash.digest()
+        self._default_idf = math.log(n_docs + 1) + 1
+        return {
+            word: math.log((n_docs + 1) / (df + 1)) + 1
+            for word, df in doc_freq.items()
+            if word not in self.stopwords
+        }
     
     def _extract_key_points(self, content: str) -> List[str]:
         """Extract key points from content"""
@@ -349,14 +750,15 @@ class ContentSummarizer:
         key_points = []
         
         for sentence in sentences:
+            sentence_lower = sentence.lower()
             # Look for sentences that seem like key points
-            if any(indicator in sentence.lower() for indicator in self.importance_indicators['high']):
-                key_points.append(sentence.strip())
-            elif sentence.strip().endswith(':'):  # Likely a header or important statement
-                key_points.append(sentence.strip())
+            if any(indicator in sentence_lower for indicator in IMPORTANCE_HIGH):
+                key_points.append(sentence)
+            elif sentence.endswith(':'):  # Likely a header or important statement
+                key_points.append(sentence)
             elif len(sentence.split()) <= 15 and any(char.isupper() for char in sentence):
                 # Short sentences with capitals might be key points
-                key_points.append(sentence.strip())
+                key_points.append(sentence)
         
         return key_points[:10]  # Limit to top 10
     
@@ -365,7 +767,8 @@ class ContentSummarizer:
         file_contents: List[Dict[str, Any]],
         total_target_tokens: int,
         model_family: str = "default",
-        context_keywords: Optional[List[str]] = None
+        context_keywords: Optional[List[str]] = None,
+        max_workers: Optional[int] = None
     ) -> List[SummaryResult]:
         """Summarize multiple files within a total token budget"""
         
@@ -374,11 +777,76 @@ class ContentSummarizer:
         
         # Calculate token budget per file
         tokens_per_file = total_target_tokens // len(file_contents)
+        contents = [str(file_content.get('content', '')) for file_content in file_contents]
+        
+        # Keywords extracted during the batch are weighted against the other files
+        if not context_keywords and len(file_contents) > 1:
+            self._corpus_idf = self._build_corpus_idf(contents)
+        
+        try:
+            precomputed = None
+            workers = min(max_workers or os.cpu_count() or 1, len(contents))
+            if workers > 1 and sum(map(len, contents)) >= PARALLEL_BATCH_MIN_CHARS:
+                precomputed = self._summarize_in_processes(
+                    contents, tokens_per_file, model_family, context_keywords, workers
+                )
+            
+            if precomputed is None:
+                # Files short enough that they may fit their share are counted up front
+                # in one batch; longer ones get counted from their summarization pass
+                self._precount_files(
+                    [content for content in contents if len(content) <= tokens_per_file * 10],
+                    model_family
+                )
+            
+            return self._summarize_within_budget(
+                file_contents, tokens_per_file, total_target_tokens, model_family, context_keywords,
+                precomputed
+            )
+        finally:
+            self._corpus_idf = None
+            self._corpus_key = None
+    
+    def _summarize_in_processes(
+        self,
+        contents: List[str],
+        tokens_per_file: int,
+        model_family: str,
+        context_keywords: Optional[List[str]],
+        max_workers: int
+    ) -> Optional[List[SummaryResult]]:
+        """Summarize every file at its full per-file share on a process pool (None on failure)"""
+        corpus = (self._corpus_idf, self._default_idf, self._corpus_key)
+        try:
+            # One chunk per worker, so the batch's IDF table is pickled once per worker
+            # rather than once per file
+            return list(self._get_process_pool().map(
+                _summarize_in_worker,
+                [(content, tokens_per_file, model_family, context_keywords, corpus) for content in contents],
+                chunksize=math.ceil(len(contents) / max_workers)
+            ))
+        except Exception as e:
+            logger.warning(f"Parallel batch summarization failed: {e}, summarizing serially")
+            return None
+    
+    def _summarize_within_budget(
+        self,
+        file_contents: List[Dict[str, Any]],
+        tokens_per_file: int,
+        remaining_budget: int,
+        model_family: str,
+        context_keywords: Optional[List[str]],
+        precomputed: Optional[List[SummaryResult]] = None
+    ) -> List[SummaryResult]:
+        """Summarize files in order, drawing each file's target from the shared budget.
+        
+        precomputed holds results summarized at the full per-file share; they are
+        used as long as the remaining budget still allows that share.
+        """
         
         summaries = []
-        remaining_budget = total_target_tokens
         
-        for file_content in file_contents:
+        for index, file_content in enumerate(file_contents):
             content = str(file_content.get('content', ''))
             filename = file_content.get('filename', 'unknown')
             
@@ -388,28 +856,56 @@ class ContentSummarizer:
             if target_tokens <= 0:
                 # Create minimal summary if no budget left
                 summary = SummaryResult(
-                    original_content=content,
                     summarized_content=f"[File: {filename} - Content omitted due to token limits]",
-                    original_tokens=self.token_counter.count_tokens(content, model_family),
+                    original_tokens=self._count(content, model_family),
                     summarized_tokens=20,
                     compression_ratio=0.01,
                     strategy_used="budget_exceeded",
                     key_points=[],
-                    metadata={"budget_exceeded": True}
+                    metadata={"budget_exceeded": True},
+                    original_content_hash=_fingerprint(content)
                 )
             else:
-                summary = self.summarize_content(
-                    content=content,
-                    target_tokens=target_tokens,
-                    strategy=SummarizationStrategy.HYBRID,
-                    model_family=model_family,
-                    context_keywords=context_keywords
-                )
+                if precomputed is not None and target_tokens == tokens_per_file:
+                    summary = precomputed[index]
+                else:
+                    summary = self.summarize_content(
+                        content=content,
+                        target_tokens=target_tokens,
+                        strategy=SummarizationStrategy.HYBRID,
+                        model_family=model_family,
+                        context_keywords=context_keywords
+                    )
                 remaining_budget -= summary.summarized_tokens
             
             summaries.append(summary)
         
         return summaries
 
+
+# Per-process summarizer for parallel batches, built once by the pool initializer
+_worker_summarizer: Optional[ContentSummarizer] = None
+
+def _init_summary_worker(token_counter):
+    """Build this worker's summarizer (the token counter is shipped once per worker, not per file)"""
+    global _worker_summarizer
+    _worker_summarizer = ContentSummarizer(token_counter)
+
+def _summarize_in_worker(
+    args: Tuple[str, int, str, Optional[List[str]], Tuple[Optional[Dict[str, float]], float, Optional[bytes]]]
+) -> SummaryResult:
+    """Summarize one file of a parallel batch with that batch's keyword weights"""
+    content, target_tokens, model_family, context_keywords, corpus = args
+    # Workers outlive a batch; the corpus key keeps their cached summaries per batch
+    summarizer = _worker_summarizer
+    summarizer._corpus_idf, summarizer._default_idf, summarizer._corpus_key = corpus
+    return summarizer.summarize_content(
+        content=content,
+        target_tokens=target_tokens,
+        strategy=SummarizationStrategy.HYBRID,
+        model_family=model_family,
+        context_keywords=context_keywords
+    )
+
 # Global instance
 content_summarizer = None  # Initialized with token_counter when needed
\ No newline at end of file
@@ -8,21 +8,160 @@ import os
 import httpx
 import json
 import logging
-from typing import Dict, List, Optional, Any, AsyncGenerator
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Any, AsyncGenerator, AsyncIterable, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
 import asyncio
+import time
 from datetime import datetime, timedelta
+from contextlib import aclosing
+from collections import deque
+from itertools import islice
+from operator import itemgetter
+
+# Optional aiohttp for high-concurrency token streaming
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Optional orjson for request bodies and the per-token JSON work in the streaming paths
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger("autopicker.model_router")
 
+if ORJSON_AVAILABLE:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers keep catching the latter
+    _json_loads = orjson.loads
+    
+    _json_encode = orjson.dumps
+    
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+    
+    def _json_encode(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+# Streamed text is pulled straight out of SSE data lines at these markers, so
+# the common chunk needs no full JSON parse (anything else falls back to one)
+_OPENAI_CONTENT_MARKER = b'"delta":{"content":'
+_ANTHROPIC_TEXT_MARKER = b'"delta":{"type":"text_delta","text":"'
+
+# OpenAI-format stream chunk around the JSON-encoded delta content
+_CHUNK_JSON_HEAD = '{"id":%s,"object":"chat.completion.chunk","created":%d,"model":%s,"choices":[{"index":0,"delta":{"content":'
+_CHUNK_JSON_TAIL = '},"finish_reason":null}]}'
+
+# SSE payloads larger than this are never fully parsed; the streams only look
+# for the text field in them (multi-MB base64 or tool-call events)
+MAX_PARSED_SSE_EVENT_BYTES = 256 * 1024
+
+# Read size for aiohttp token streams; lines longer than this span several reads
+STREAM_CHUNK_SIZE = 64 * 1024
+
+def _json_string_end(data: bytes, start: int) -> int:
+    """Index of the closing quote of a JSON string whose body starts at start, or -1"""
+    end = data.find(b'"', start)
+    while end >= 0:
+        backslashes = 0
+        i = end - 1
+        while i >= start and data[i] == 0x5C:  # backslash
+            backslashes += 1
+            i -= 1
+        if backslashes % 2 == 0:
+            return end
+        end = data.find(b'"', end + 1)
+    return -1
+
+def _looks_like_json_document(data: bytes) -> bool:
+    """Cheap check that an SSE payload can be a complete JSON object or array"""
+    return data.rstrip().endswith((b"}", b"]"))
+
+def _extract_json_string(data: bytes, marker: bytes) -> Optional[bytes]:
+    """Still-escaped body of the JSON string that follows marker, or None if there is none"""
+    start = data.find(marker)
+    if start < 0:
+        return None
+    start += len(marker)
+    end = _json_string_end(data, start)
+    if end < 0:
+        return None
+    return data[start:end]
+
 class ModelProvider(Enum):
     OPENROUTER = "openrouter"
     OLLAMA = "ollama"
     ANTHROPIC = "anthropic"
     OPENAI = "openai"
 
-@dataclass
+# Capability bit flags, so a capability check is one integer AND
+CAP_TEXT = 1
+CAP_VISION = 2
+CAP_FUNCTION_CALLING = 4
+CAP_JSON_MODE = 8
+
+CAPABILITY_FLAGS = {
+    "text": CAP_TEXT,
+    "vision": CAP_VISION,
+    "function_calling": CAP_FUNCTION_CALLING,
+    "json_mode": CAP_JSON_MODE
+}
+
+# Request wording that signals a more demanding task
+ANALYSIS_KEYWORDS = (
+    "analyze", "compare", "detailed", "comprehensive", "complex",
+    "summary", "report", "research", "data", "statistics"
+)
+SPECIAL_DOMAIN_KEYWORDS = ("financial", "legal", "medical", "technical")
+
+# Direct provider endpoints, relative to each provider client's base URL
+OPENAI_CHAT_PATH = "/v1/chat/completions"
+ANTHROPIC_MESSAGES_PATH = "/v1/messages"
+
+# Billing events kept in memory; older events are dropped as new ones arrive
+MAX_BILLING_EVENTS = 100_000
+USAGE_FLUSH_INTERVAL = 1.0  # Seconds between background usage aggregation passes
+
+# Scoring bonus for models served through each provider (OpenRouter > Ollama for most cases)
+PROVIDER_SCORE_BONUS = {
+    ModelProvider.OPENROUTER: 10,
+    ModelProvider.OLLAMA: 5  # Local models get some bonus for privacy/availability
+}
+
+def _complexity_tier_scores(model_id: str) -> Tuple[float, float, float]:
+    """Score of a model for (low, medium, high) complexity requests, from its model id"""
+    # High complexity - prefer powerful models
+    if "gpt-4o" in model_id or "claude-3.5-sonnet" in model_id or "405b" in model_id:
+        high = 50.0
+    elif "gpt-4o-mini" in model_id or "claude-3-haiku" in model_id or "70b" in model_id:
+        high = 30.0
+    else:
+        high = 0.0
+    
+    # Medium complexity - balanced models
+    if "gpt-4o-mini" in model_id or "claude-3-haiku" in model_id or "70b" in model_id:
+        medium = 40.0
+    elif "gpt-3.5-turbo" in model_id or "8b" in model_id:
+        medium = 30.0
+    else:
+        medium = 0.0
+    
+    # Low complexity - prefer fast/cheap models
+    if "gpt-3.5-turbo" in model_id or "8b" in model_id or "local" in model_id:
+        low = 40.0
+    else:
+        low = 0.0
+    
+    return (low, medium, high)
+
+@dataclass(slots=True, frozen=True)
 class ModelInfo:
     id: str
     name: str
@@ -35,10 +174,25 @@ class ModelInfo:
     best_for: List[str]
     enterprise_cost: Optional[float] = None  # Enterprise pricing for direct APIs
     pricing_tier: str = "standard"  # "standard" (OpenRouter) or "enterprise" (direct)
+    cap_mask: int = field(init=False, repr=False)  # CAPABILITY_FLAGS of capabilities
+    
+    def __post_init__(self):
+        cap_mask = 0
+        for capability in self.capabilities:
+            cap_mask |= CAPABILITY_FLAGS.get(capability, 0)
+        object.__setattr__(self, "cap_mask", cap_mask)
 
 class EnhancedModelRouter:
     """Enhanced model router with multiple provider support"""
     
+    # Legacy model names still accepted from clients
+    _LEGACY_MODEL_MAP = {
+        "llama3.2-local": "llama3.2-local",
+        "gpt-4": "gpt-4o",
+        "gpt-4-turbo": "gpt-4o",
+        "claude-3-sonnet": "claude-3.5-sonnet"
+    }
+    
     def __init__(self):
         self.openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
         self.openai_api_key = os.getenv("OPENAI_API_KEY") 
@@ -52,17 +206,195 @@ class EnhancedModelRouter:
         # Model definitions
         self.models = self._initialize_models()
         
+        # Models grouped by provider (in definition order) with the union of their
+        # capabilities, so selection can skip a whole provider that is unavailable
+        # or cannot serve the request, e.g. text-only Ollama for image inputs
+        models_by_provider: Dict[ModelProvider, List[Tuple[str, ModelInfo]]] = {}
+        self._provider_cap_masks: Dict[ModelProvider, int] = {}
+        for model_id, model in self.models.items():
+            models_by_provider.setdefault(model.provider, []).append((model_id, model))
+            self._provider_cap_masks[model.provider] = self._provider_cap_masks.get(model.provider, 0) | model.cap_mask
+        self._models_by_provider = {
+            provider: tuple(items) for provider, items in models_by_provider.items()
+        }
+        
+        # Model ids are fixed after init, so the id-based complexity scoring is
+        # worked out once per model instead of on every selection
+        self._complexity_scores = {
+            model_id: _complexity_tier_scores(model_id) for model_id in self.models
+        }
+        
         # Fallback preferences (enterprise APIs preferred if available)
-        self.fallback_order = [
-            ModelProvider.OPENAI if self.enable_enterprise_apis else ModelProvider.OPENROUTER,
-            ModelProvider.ANTHROPIC if self.enable_enterprise_apis else ModelProvider.OPENROUTER,
-            ModelProvider.OPENROUTER,
-            ModelProvider.OLLAMA
-        ]
-        
-        # Usage tracking for Stripe billing
+        enterprise_providers = (ModelProvider.OPENAI, ModelProvider.ANTHROPIC) if self.enable_enterprise_apis else ()
+        self.fallback_order = enterprise_providers + (ModelProvider.OPENROUTER, ModelProvider.OLLAMA)
+        
+        # Provider availability and model listings only change with the provider
+        # credentials, so they are worked out once and redone if a key is swapped
+        # at runtime
+        self._listing_credentials = None
+        self._provider_available: Dict[ModelProvider, bool] = {}
+        self._available_models_cache: Optional[List[Dict]] = None
+        self._model_info_cache: Dict[str, Dict] = {}
+        self._sync_credentials()
+        
+        # Usage tracking for Stripe billing (totals are kept up to date per event,
+        # so reading them never rescans the per-model stats). Calls only queue a
+        # tuple; a background task turns them into events and aggregates.
         self.usage_stats = {}
-        self.billing_events = []
+        self.billing_events = deque(maxlen=MAX_BILLING_EVENTS)
+        self._usage_totals = {"total_cost": 0.0, "total_requests": 0, "total_tokens": 0}
+        self._pending_usage = deque()
+        self._usage_flusher: Optional[asyncio.Task] = None
+        
+        # Long-lived clients per provider so calls reuse keep-alive connections
+        # instead of paying a new TCP/TLS handshake every request. OpenRouter
+        # speaks HTTP/2, so concurrent calls multiplex over a few connections.
+        self._openrouter_headers = {
+            "Authorization": f"Bearer {self.openrouter_api_key}",
+            "HTTP-Referer": "https://autopicker.ai",
+            "X-Title": "Autopicker Platform"
+        }
+        self._openrouter_client = httpx.AsyncClient(
+            base_url="https://openrouter.ai",
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_connections=1000, max_keepalive_connections=200),
+            http2=True,
+            headers=self._openrouter_headers
+        )
+        self._ollama_client = httpx.AsyncClient(
+            base_url="http://localhost:11434",
+            timeout=httpx.Timeout(300.0)
+        )
+        self._openai_headers = {
+            "Authorization": f"Bearer {self.openai_api_key}",
+            "Content-Type": "application/json"
+        }
+        self._openai_client = httpx.AsyncClient(
+            base_url="https://api.openai.com",
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            http2=True,
+            headers=self._openai_headers
+        )
+        self._anthropic_headers = {
+            "x-api-key": self.anthropic_api_key or "",
+            "Content-Type": "application/json",
+            "anthropic-version": "2023-06-01"
+        }
+        self._anthropic_client = httpx.AsyncClient(
+            base_url="https://api.anthropic.com",
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+            http2=True,
+            headers=self._anthropic_headers
+        )
+        
+        # Token streams go through aiohttp when installed, which keeps many
+        # concurrent streams moving better than httpx; created on first use
+        # since a session must belong to the running event loop
+        self._stream_session = None
+    
+    async def aclose(self):
+        """Close the shared provider clients (called on application shutdown)"""
+        if self._usage_flusher is not None:
+            self._usage_flusher.cancel()
+            self._usage_flusher = None
+        self._flush_usage()
+        await self._openrouter_client.aclose()
+        await self._ollama_client.aclose()
+        await self._openai_client.aclose()
+        await self._anthropic_client.aclose()
+        if self._stream_session is not None:
+            await self._stream_session.close()
+    
+    def _get_stream_session(self) -> "aiohttp.ClientSession":
+        """Shared aiohttp session for streaming responses"""
+        if self._stream_session is None or self._stream_session.closed:
+            self._stream_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=1000, limit_per_host=256, keepalive_timeout=60)
+            )
+        return self._stream_session
+    
+    async def _stream_lines(
+        self,
+        client: httpx.AsyncClient,
+        path: str,
+        payload: Dict,
+        read_timeout: float,
+        headers: Optional[Dict[str, str]] = None
+    ) -> AsyncGenerator[bytes, None]:
+        """POST payload to one of the provider clients and yield the raw response body line by line
+        
+        headers are the provider headers the client was built with; they are passed
+        explicitly so httpx's own defaults (User-Agent and so on) aren't sent over aiohttp.
+        Lines are left as undecoded bytes (possibly with a trailing carriage return) since
+        the JSON parser takes bytes directly and most SSE framing lines are skipped anyway.
+        """
+        if AIOHTTP_AVAILABLE:
+            async with self._get_stream_session().post(
+                str(client.base_url.join(path)),
+                json=payload,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=5.0, sock_read=read_timeout)
+            ) as response:
+                response.raise_for_status()
+                # Read chunks rather than response.content's readline, which rejects
+                # lines over its buffer limit (large data: payloads are legitimate)
+                async for line in self._split_lines(response.content.iter_chunked(STREAM_CHUNK_SIZE)):
+                    yield line
+        else:
+            async with client.stream("POST", path, json=payload) as response:
+                response.raise_for_status()
+                async for line in self._iter_response_lines(response):
+                    yield line
+    
+    @staticmethod
+    async def _iter_response_lines(response: httpx.Response) -> AsyncGenerator[bytes, None]:
+        """Split an httpx response body into raw byte lines"""
+        async for line in EnhancedModelRouter._split_lines(response.aiter_bytes()):
+            yield line
+    
+    @staticmethod
+    async def _split_lines(chunks: AsyncIterable[bytes]) -> AsyncGenerator[bytes, None]:
+        """Split a stream of byte chunks into raw byte lines, however long"""
+        # Pieces of a line still waiting for its newline, joined once it arrives so
+        # a long line spread over many chunks is copied only once
+        pending: List[bytes] = []
+        async for chunk in chunks:
+            start = 0
+            while (end := chunk.find(b"\n", start)) >= 0:
+                if pending:
+                    pending.append(chunk[start:end])
+                    yield b"".join(pending)
+                    pending = []
+                else:
+                    yield chunk[start:end]
+                start = end + 1
+            if start < len(chunk):
+                pending.append(chunk[start:])
+        if pending:
+            yield b"".join(pending)
+    
+    @staticmethod
+    async def _iter_sse_events(response: httpx.Response) -> AsyncGenerator[bytes, None]:
+        """Yield the data payload of each server-sent event in an httpx response
+        
+        Multi-line data fields are joined with newlines as the SSE format specifies;
+        event names, ids and comments are dropped.
+        """
+        data_lines = []
+        async for line in EnhancedModelRouter._iter_response_lines(response):
+            line = line.rstrip(b"\r")
+            if not line:
+                # A blank line ends the event
+                if data_lines:
+                    yield b"\n".join(data_lines)
+                    data_lines = []
+            elif line.startswith(b"data:"):
+                data = line[5:]
+                data_lines.append(data[1:] if data.startswith(b" ") else data)
+        if data_lines:
+            yield b"\n".join(data_lines)
         
     def _initialize_models(self) -> Dict[str, ModelInfo]:
         """Initialize available models from different providers"""
@@ -268,8 +600,14 @@ class EnhancedModelRouter:
         """Enhanced complexity calculation"""
         complexity_score = 0.0
         
-        # Message complexity
-        total_message_length = sum(len(msg.content) for msg in request.messages)
+        # Message complexity (length and lowercased text gathered in one pass)
+        total_message_length = 0
+        lowered_parts = []
+        for msg in request.messages:
+            text = msg.content
+            total_message_length += len(text)
+            lowered_parts.append(text.lower())
+        
         if total_message_length > 5000:
             complexity_score += 40
         elif total_message_length > 2000:
@@ -309,17 +647,12 @@ class EnhancedModelRouter:
                 complexity_score += 10  # Multiple file types
         
         # Content analysis keywords
-        content = " ".join(msg.content.lower() for msg in request.messages)
-        analysis_keywords = [
-            "analyze", "compare", "detailed", "comprehensive", "complex",
-            "summary", "report", "research", "data", "statistics"
-        ]
-        
-        keyword_matches = sum(1 for keyword in analysis_keywords if keyword in content)
+        content = " ".join(lowered_parts)
+        keyword_matches = sum(1 for keyword in ANALYSIS_KEYWORDS if keyword in content)
         complexity_score += keyword_matches * 5
         
         # Special request types
-        if any(word in content for word in ["financial", "legal", "medical", "technical"]):
+        if any(word in content for word in SPECIAL_DOMAIN_KEYWORDS):
             complexity_score += 15
         
         return min(complexity_score, 100.0)  # Cap at 100
@@ -328,28 +661,24 @@ class EnhancedModelRouter:
         """Select the best model based on complexity, capabilities, and cost"""
         
         # If user explicitly specified a model
-        if hasattr(request, 'model') and request.model and request.model != "auto":
-            if request.model in self.models:
-                return request.model
+        requested_model = getattr(request, "model", None)
+        if requested_model and requested_model != "auto":
+            if requested_model in self.models:
+                return requested_model
             # Try to map legacy model names
-            legacy_mapping = {
-                "llama3.2-local": "llama3.2-local",
-                "gpt-4": "gpt-4o",
-                "gpt-4-turbo": "gpt-4o",
-                "claude-3-sonnet": "claude-3.5-sonnet"
-            }
-            if request.model in legacy_mapping:
-                return legacy_mapping[request.model]
+            legacy_model = self._LEGACY_MODEL_MAP.get(requested_model)
+            if legacy_model:
+                return legacy_model
         
         # Calculate complexity
         complexity_score = self.calculate_complexity_score(request, file_info)
         
         # Determine required capabilities
-        required_capabilities = ["text"]
+        required_mask = CAP_TEXT
         if file_info:
             file_types = set(info.get("file_type", "") for info in file_info)
             if any(ft in ["jpg", "jpeg", "png", "gif", "webp", "bmp"] for ft in file_types):
-                required_capabilities.append("vision")
+                required_mask |= CAP_VISION
         
         # Get user preferences
         preferences = user_preferences or {}
@@ -358,52 +687,43 @@ class EnhancedModelRouter:
         prefer_cheap = preferences.get("prefer_cheap", False)
         
         # Filter models by capabilities and availability
+        self._sync_credentials()
+        provider_available = self._provider_available
         suitable_models = []
-        for model_id, model in self.models.items():
-            # Check if model has required capabilities
-            if not all(cap in model.capabilities for cap in required_capabilities):
-                continue
-            
-            # Check cost constraints
-            if model.cost_per_1k_tokens > max_cost:
-                continue
-            
-            # Check if provider is available
-            if model.provider == ModelProvider.OPENROUTER and not self.openrouter_api_key:
-                continue
-            elif model.provider == ModelProvider.OPENAI and not self.openai_api_key:
+        for provider, provider_models in self._models_by_provider.items():
+            # Check if provider is available and has any model with the required capabilities
+            if not provider_available[provider]:
                 continue
-            elif model.provider == ModelProvider.ANTHROPIC and not self.anthropic_api_key:
+            if (self._provider_cap_masks[provider] & required_mask) != required_mask:
                 continue
             
-            suitable_models.append((model_id, model))
+            for model_id, model in provider_models:
+                # Check if model has required capabilities
+                if (model.cap_mask & required_mask) != required_mask:
+                    continue
+                
+                # Check cost constraints
+                if model.cost_per_1k_tokens > max_cost:
+                    continue
+                
+                suitable_models.append((model_id, model))
         
         if not suitable_models:
             logger.warning("No suitable models found, falling back to local model")
             return "llama3.2-local"
         
         # Score models based on complexity and preferences
+        if complexity_score >= 70:
+            tier = 2  # High complexity
+        elif complexity_score >= 40:
+            tier = 1  # Medium complexity
+        else:
+            tier = 0  # Low complexity
+        
         scored_models = []
         for model_id, model in suitable_models:
-            score = 0.0
-            
             # Complexity-based scoring
-            if complexity_score >= 70:
-                # High complexity - prefer powerful models
-                if "gpt-4o" in model_id or "claude-3.5-sonnet" in model_id or "405b" in model_id:
-                    score += 50
-                elif "gpt-4o-mini" in model_id or "claude-3-haiku" in model_id or "70b" in model_id:
-                    score += 30
-            elif complexity_score >= 40:
-                # Medium complexity - balanced models
-                if "gpt-4o-mini" in model_id or "claude-3-haiku" in model_id or "70b" in model_id:
-                    score += 40
-                elif "gpt-3.5-turbo" in model_id or "8b" in model_id:
-                    score += 30
-            else:
-                # Low complexity - prefer fast/cheap models
-                if "gpt-3.5-turbo" in model_id or "8b" in model_id or "local" in model_id:
-                    score += 40
+            score = self._complexity_scores[model_id][tier]
             
             # Preference adjustments
             if prefer_fast:
@@ -414,11 +734,8 @@ class EnhancedModelRouter:
                 # Inverse cost scoring (cheaper = higher score)
                 score += max(0, 10 - model.cost_per_1k_tokens) * 5
             
-            # Provider preference (OpenRouter > Ollama for most cases)
-            if model.provider == ModelProvider.OPENROUTER:
-                score += 10
-            elif model.provider == ModelProvider.OLLAMA:
-                score += 5  # Local models get some bonus for privacy/availability
+            # Provider preference
+            score += PROVIDER_SCORE_BONUS.get(model.provider, 0)
             
             # Context length bonus for large files
             if file_info and len(file_info) > 5:
@@ -429,13 +746,11 @@ class EnhancedModelRouter:
             
             scored_models.append((score, model_id, model))
         
-        # Sort by score (highest first)
-        scored_models.sort(key=lambda x: x[0], reverse=True)
+        # Select best model (max keeps the first of equally scored models)
+        best_score, best_model_id, best_model = max(scored_models, key=itemgetter(0))
         
-        # Select best model
-        best_score, best_model_id, best_model = scored_models[0]
-        
-        logger.info(f"Model selection: complexity={complexity_score:.1f}, selected={best_model_id} (score={best_score:.1f})")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Model selection: complexity=%.1f, selected=%s (score=%.1f)", complexity_score, best_model_id, best_score)
         
         return best_model_id
     
@@ -458,15 +773,27 @@ class EnhancedModelRouter:
         else:
             raise ValueError(f"Unsupported provider: {model.provider}")
     
+    async def batch_call(self, jobs: List[Tuple[str, List[Dict]]], max_in_flight: int = 64, **kwargs) -> List[Any]:
+        """Make several independent non-streaming calls concurrently
+        
+        jobs is a list of (model_id, messages) pairs; results come back in the same
+        order, with a failed call's exception in place of its response. At most
+        max_in_flight calls are open at once. Local Ollama only serves
+        OLLAMA_NUM_PARALLEL requests per model at a time and queues the rest.
+        """
+        semaphore = asyncio.Semaphore(max_in_flight)
+        
+        async def run_job(model_id: str, messages: List[Dict]) -> Any:
+            async with semaphore:
+                return await self.make_api_call(model_id, messages, **kwargs)
+        
+        return await asyncio.gather(
+            *(run_job(model_id, messages) for model_id, messages in jobs),
+            return_exceptions=True
+        )
+    
     async def _call_openrouter(self, model: ModelInfo, messages: List[Dict], stream: bool = False, **kwargs) -> Any:
         """Call OpenRouter API"""
-        headers = {
-            "Authorization": f"Bearer {self.openrouter_api_key}",
-            "HTTP-Referer": "https://autopicker.ai",
-            "X-Title": "Autopicker Platform",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "model": model.id,
             "messages": messages,
@@ -474,55 +801,48 @@ class EnhancedModelRouter:
             **kwargs
         }
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            if stream:
-                return self._stream_openrouter_response(client, headers, payload)
-            else:
-                response = await client.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                return response.json()
+        if stream:
+            return self._stream_openrouter_response(payload)
+        
+        response = await self._openrouter_client.post("/api/v1/chat/completions", json=payload)
+        response.raise_for_status()
+        return response.json()
     
-    async def _stream_openrouter_response(self, client: httpx.AsyncClient, headers: Dict, payload: Dict) -> AsyncGenerator[str, None]:
+    async def _stream_openrouter_response(self, payload: Dict) -> AsyncGenerator[str, None]:
         """Stream response from OpenRouter"""
-        async with client.stream(
-            "POST",
-            "https://openrouter.ai/api/v1/chat/completions",
-            headers=headers,
-            json=payload
-        ) as response:
-            response.raise_for_status()
-            
-            async for line in response.aiter_lines():
-                if line.strip():
-                    if line.startswith("data: "):
-                        data_str = line[6:]  # Remove "data: " prefix
-                        if data_str.strip() == "[DONE]":
-                            break
-                        
-                        try:
-                            data = json.loads(data_str)
-                            if "choices" in data and len(data["choices"]) > 0:
-                                delta = data["choices"][0].get("delta", {})
-                                if "content" in delta:
-                                    content = delta["content"]
-                                    if content:
-                                        yield json.dumps({
-                                            "id": data.get("id", "chatcmpl-autopicker"),
-                                            "object": "chat.completion.chunk",
-                                            "created": int(datetime.now().timestamp()),
-                                            "model": payload["model"],
-                                            "choices": [{
-                                                "index": 0,
-                                                "delta": {"content": content},
-                                                "finish_reason": None
-                                            }]
-                                        })
-                        except json.JSONDecodeError:
-                            continue
+        async with aclosing(self._stream_lines(
+            self._openrouter_client, "/api/v1/chat/completions", payload, read_timeout=60.0,
+            headers=self._openrouter_headers
+        )) as lines:
+            created = int(time.time())
+            async for line in lines:
+                # Byte-level prefix checks; blank lines, comments and event names are skipped
+                if not line.startswith(b"data: "):
+                    continue
+                data_str = line[6:]  # Remove "data: " prefix
+                if data_str.startswith(b"[DONE]"):
+                    break
+                
+                try:
+                    data = _json_loads(data_str)
+                    if "choices" in data and len(data["choices"]) > 0:
+                        delta = data["choices"][0].get("delta", {})
+                        if "content" in delta:
+                            content = delta["content"]
+                            if content:
+                                yield _json_dumps({
+                                    "id": data.get("id", "chatcmpl-autopicker"),
+                                    "object": "chat.completion.chunk",
+                                    "created": created,
+                                    "model": payload["model"],
+                                    "choices": [{
+                                        "index": 0,
+                                        "delta": {"content": content},
+                                        "finish_reason": None
+                                    }]
+                                })
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
     
     async def _call_ollama(self, model: ModelInfo, messages: List[Dict], stream: bool = False, **kwargs) -> Any:
         """Call local Ollama API"""
@@ -532,90 +852,110 @@ class EnhancedModelRouter:
             "stream": stream
         }
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            if stream:
-                return self._stream_ollama_response(client, payload)
-            else:
-                response = await client.post(
-                    "http://localhost:11434/api/chat",
-                    json=payload
-                )
-                
-                if response.status_code == 200:
-                    ollama_response = response.json()
-                    # Convert Ollama response to OpenAI format
-                    return {
-                        "id": f"chatcmpl-{datetime.now().timestamp()}",
-                        "object": "chat.completion",
-                        "created": int(datetime.now().timestamp()),
-                        "model": model.id,
-                        "choices": [{
-                            "index": 0,
-                            "message": {
-                                "role": "assistant",
-                                "content": ollama_response.get("message", {}).get("content", "")
-                            },
-                            "finish_reason": "stop"
-                        }],
-                        "usage": {
-                            "prompt_tokens": 0,
-                            "completion_tokens": 0,
-                            "total_tokens": 0
-                        }
-                    }
-                else:
-                    raise httpx.HTTPError(f"Ollama API error: {response.status_code}")
+        if stream:
+            return self._stream_ollama_response(payload)
+        
+        response = await self._ollama_client.post("/api/chat", json=payload)
+        
+        if response.status_code == 200:
+            ollama_response = response.json()
+            # Convert Ollama response to OpenAI format
+            now = time.time()
+            return {
+                "id": f"chatcmpl-{now}",
+                "object": "chat.completion",
+                "created": int(now),
+                "model": model.id,
+                "choices": [{
+                    "index": 0,
+                    "message": {
+                        "role": "assistant",
+                        "content": ollama_response.get("message", {}).get("content", "")
+                    },
+                    "finish_reason": "stop"
+                }],
+                "usage": {
+                    "prompt_tokens": 0,
+                    "completion_tokens": 0,
+                    "total_tokens": 0
+                }
+            }
+        else:
+            raise httpx.HTTPError(f"Ollama API error: {response.status_code}")
     
-    async def _stream_ollama_response(self, client: httpx.AsyncClient, payload: Dict) -> AsyncGenerator[str, None]:
+    async def _stream_ollama_response(self, payload: Dict) -> AsyncGenerator[str, None]:
         """Stream response from Ollama"""
-        async with client.stream("POST", "http://localhost:11434/api/chat", json=payload) as response:
-            if response.status_code == 200:
-                async for line in response.aiter_lines():
-                    if line.strip():
-                        try:
-                            ollama_response = json.loads(line)
-                            
-                            if "message" in ollama_response and "content" in ollama_response["message"]:
-                                content = ollama_response["message"]["content"]
-                                if content:
-                                    yield json.dumps({
-                                        "id": f"chatcmpl-{datetime.now().timestamp()}",
-                                        "object": "chat.completion.chunk",
-                                        "created": int(datetime.now().timestamp()),
-                                        "model": payload["model"],
-                                        "choices": [{
-                                            "index": 0,
-                                            "delta": {"content": content},
-                                            "finish_reason": None
-                                        }]
-                                    })
-                            
-                            if ollama_response.get("done", False):
-                                yield json.dumps({
-                                    "id": f"chatcmpl-{datetime.now().timestamp()}",  
+        async with aclosing(self._stream_lines(
+            self._ollama_client, "/api/chat", payload, read_timeout=300.0
+        )) as lines:
+            # One id and timestamp for the whole stream, as OpenAI does
+            started = time.time()
+            stream_id = f"chatcmpl-{started}"
+            created = int(started)
+            async for line in lines:
+                if line and not line.isspace():
+                    try:
+                        ollama_response = _json_loads(line)
+                        
+                        if "message" in ollama_response and "content" in ollama_response["message"]:
+                            content = ollama_response["message"]["content"]
+                            if content:
+                                yield _json_dumps({
+                                    "id": stream_id,
                                     "object": "chat.completion.chunk",
-                                    "created": int(datetime.now().timestamp()),
+                                    "created": created,
                                     "model": payload["model"],
                                     "choices": [{
                                         "index": 0,
-                                        "delta": {},
-                                        "finish_reason": "stop"
+                                        "delta": {"content": content},
+                                        "finish_reason": None
                                     }]
                                 })
-                                break
-                                
-                        except json.JSONDecodeError:
-                            continue
+                        
+                        if ollama_response.get("done", False):
+                            yield _json_dumps({
+                                "id": stream_id,
+                                "object": "chat.completion.chunk",
+                                "created": created,
+                                "model": payload["model"],
+                                "choices": [{
+                                    "index": 0,
+                                    "delta": {},
+                                    "finish_reason": "stop"
+                                }]
+                            })
+                            break
+                            
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        continue
+    
+    def _sync_credentials(self):
+        """Refresh provider availability and drop cached listings if the credentials changed"""
+        credentials = (self.openrouter_api_key, self.openai_api_key, self.anthropic_api_key)
+        if credentials != self._listing_credentials:
+            self._listing_credentials = credentials
+            self._provider_available = {
+                ModelProvider.OPENROUTER: bool(self.openrouter_api_key),
+                ModelProvider.OPENAI: bool(self.openai_api_key),
+                ModelProvider.ANTHROPIC: bool(self.anthropic_api_key),
+                ModelProvider.OLLAMA: True
+            }
+            self._available_models_cache = None
+            self._model_info_cache.clear()
     
     def get_available_models(self) -> List[Dict]:
-        """Get list of available models"""
+        """Get list of available models (cached; callers must not modify it)"""
+        self._sync_credentials()
+        if self._available_models_cache is None:
+            self._available_models_cache = self._build_available_models()
+        return self._available_models_cache
+    
+    def _build_available_models(self) -> List[Dict]:
         models_list = []
         
         for model_id, model in self.models.items():
             # Check if provider is available
-            available = True
-            if model.provider == ModelProvider.OPENROUTER and not self.openrouter_api_key:
-                available = False
+            available = self._provider_available[model.provider]
             
             models_list.append({
                 "id": model_id,
@@ -636,15 +976,15 @@ class EnhancedModelRouter:
         if model_id not in self.models:
             return {"error": f"Model {model_id} not found"}
         
+        self._sync_credentials()
+        info = self._model_info_cache.get(model_id)
+        if info is None:
+            info = self._model_info_cache[model_id] = self._build_model_info(model_id)
+        return info
+    
+    def _build_model_info(self, model_id: str) -> Dict:
         model = self.models[model_id]
-        available = True
-        
-        if model.provider == ModelProvider.OPENROUTER and not self.openrouter_api_key:
-            available = False
-        elif model.provider == ModelProvider.OPENAI and not self.openai_api_key:
-            available = False
-        elif model.provider == ModelProvider.ANTHROPIC and not self.anthropic_api_key:
-            available = False
+        available = self._provider_available[model.provider]
         
         return {
             "id": model_id,
@@ -663,11 +1003,6 @@ class EnhancedModelRouter:
     
     async def _call_openai_direct(self, model: ModelInfo, messages: List[Dict], stream: bool = False, **kwargs) -> Any:
         """Call OpenAI API directly"""
-        headers = {
-            "Authorization": f"Bearer {self.openai_api_key}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "model": model.id,
             "messages": messages,
@@ -675,55 +1010,57 @@ class EnhancedModelRouter:
             **kwargs
         }
         
-        # Track usage for billing
-        self.track_usage(model.id, len(str(messages)), model.cost_per_1k_tokens)
+        # Encode once; the body size doubles as the usage estimate for billing
+        body = _json_encode(payload)
+        self.track_usage(model.id, len(body), model.cost_per_1k_tokens)
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            if stream:
-                return self._stream_openai_direct_response(client, headers, payload)
-            else:
-                response = await client.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                return response.json()
+        if stream:
+            return self._stream_openai_direct_response(body)
+        
+        response = await self._openai_client.post(
+            OPENAI_CHAT_PATH,
+            content=body
+        )
+        response.raise_for_status()
+        return _json_loads(response.content)
     
-    async def _stream_openai_direct_response(self, client: httpx.AsyncClient, headers: Dict, payload: Dict) -> AsyncGenerator[str, None]:
+    async def _stream_openai_direct_response(self, body: bytes) -> AsyncGenerator[str, None]:
         """Stream response from OpenAI direct API"""
-        async with client.stream(
+        async with self._openai_client.stream(
             "POST",
-            "https://api.openai.com/v1/chat/completions",
-            headers=headers,
-            json=payload
+            OPENAI_CHAT_PATH,
+            content=body
         ) as response:
             response.raise_for_status()
             
-            async for line in response.aiter_lines():
-                if line.strip():
-                    if line.startswith("data: "):
-                        data_str = line[6:]  # Remove "data: " prefix
-                        if data_str.strip() == "[DONE]":
-                            break
-                        
-                        try:
-                            data = json.loads(data_str)
-                            if "choices" in data and len(data["choices"]) > 0:
-                                delta = data["choices"][0].get("delta", {})
-                                if "content" in delta:
-                                    yield json.dumps(data)
-                        except json.JSONDecodeError:
-                            continue
+            async for data_str in self._iter_sse_events(response):
+                if data_str.startswith(b"[DONE]"):
+                    break
+                
+                try:
+                    # Content chunks are already in OpenAI format; pass them on as sent
+                    if _OPENAI_CONTENT_MARKER in data_str:
+                        yield data_str.decode("utf-8").strip()
+                        continue
+                    
+                    if len(data_str) > MAX_PARSED_SSE_EVENT_BYTES:
+                        # Too big to parse per event; forward it only if it carries content
+                        if b'"content":' in data_str:
+                            yield data_str.decode("utf-8").strip()
+                        continue
+                    
+                    if not _looks_like_json_document(data_str):
+                        continue
+                    data = _json_loads(data_str)
+                    if "choices" in data and len(data["choices"]) > 0:
+                        delta = data["choices"][0].get("delta", {})
+                        if "content" in delta:
+                            yield _json_dumps(data)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
     
     async def _call_anthropic_direct(self, model: ModelInfo, messages: List[Dict], stream: bool = False, **kwargs) -> Any:
         """Call Anthropic API directly"""
-        headers = {
-            "x-api-key": self.anthropic_api_key,
-            "Content-Type": "application/json",
-            "anthropic-version": "2023-06-01"
-        }
-        
         # Convert OpenAI format to Anthropic format
         system_message = ""
         anthropic_messages = []
@@ -748,114 +1085,159 @@ class EnhancedModelRouter:
         if system_message:
             payload["system"] = system_message
         
-        # Track usage for billing
-        self.track_usage(model.id, len(str(messages)), model.cost_per_1k_tokens)
+        # Encode once; the body size doubles as the usage estimate for billing
+        body = _json_encode(payload)
+        self.track_usage(model.id, len(body), model.cost_per_1k_tokens)
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            if stream:
-                return self._stream_anthropic_direct_response(client, headers, payload)
-            else:
-                response = await client.post(
-                    "https://api.anthropic.com/v1/messages",
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                anthropic_response = response.json()
-                
-                # Convert Anthropic format back to OpenAI format
-                return {
-                    "id": f"chatcmpl-{datetime.now().timestamp()}",
-                    "object": "chat.completion",
-                    "created": int(datetime.now().timestamp()),
-                    "model": model.id,
-                    "choices": [{
-                        "index": 0,
-                        "message": {
-                            "role": "assistant",
-                            "content": anthropic_response.get("content", [{}])[0].get("text", "")
-                        },
-                        "finish_reason": "stop"
-                    }],
-                    "usage": {
-                        "prompt_tokens": anthropic_response.get("usage", {}).get("input_tokens", 0),
-                        "completion_tokens": anthropic_response.get("usage", {}).get("output_tokens", 0),
-                        "total_tokens": anthropic_response.get("usage", {}).get("input_tokens", 0) + anthropic_response.get("usage", {}).get("output_tokens", 0)
-                    }
-                }
+        if stream:
+            return self._stream_anthropic_direct_response(body, model.id)
+        
+        response = await self._anthropic_client.post(
+            ANTHROPIC_MESSAGES_PATH,
+            content=body
+        )
+        response.raise_for_status()
+        anthropic_response = _json_loads(response.content)
+        
+        # Convert Anthropic format back to OpenAI format
+        now = time.time()
+        return {
+            "id": f"chatcmpl-{now}",
+            "object": "chat.completion",
+            "created": int(now),
+            "model": model.id,
+            "choices": [{
+                "index": 0,
+                "message": {
+                    "role": "assistant",
+                    "content": anthropic_response.get("content", [{}])[0].get("text", "")
+                },
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": anthropic_response.get("usage", {}).get("input_tokens", 0),
+                "completion_tokens": anthropic_response.get("usage", {}).get("output_tokens", 0),
+                "total_tokens": anthropic_response.get("usage", {}).get("input_tokens", 0) + anthropic_response.get("usage", {}).get("output_tokens", 0)
+            }
+        }
     
-    async def _stream_anthropic_direct_response(self, client: httpx.AsyncClient, headers: Dict, payload: Dict) -> AsyncGenerator[str, None]:
+    async def _stream_anthropic_direct_response(self, body: bytes, model_id: str) -> AsyncGenerator[str, None]:
         """Stream response from Anthropic direct API"""
-        async with client.stream(
+        async with self._anthropic_client.stream(
             "POST",
-            "https://api.anthropic.com/v1/messages",
-            headers=headers,
-            json=payload
+            ANTHROPIC_MESSAGES_PATH,
+            content=body
         ) as response:
             response.raise_for_status()
             
-            async for line in response.aiter_lines():
-                if line.strip():
-                    if line.startswith("data: "):
-                        data_str = line[6:]  # Remove "data: " prefix
-                        if data_str.strip() == "[DONE]":
-                            break
-                        
-                        try:
-                            data = json.loads(data_str)
-                            if data.get("type") == "content_block_delta":
-                                content = data.get("delta", {}).get("text", "")
-                                if content:
-                                    # Convert to OpenAI format
-                                    yield json.dumps({
-                                        "id": f"chatcmpl-{datetime.now().timestamp()}",
-                                        "object": "chat.completion.chunk",
-                                        "created": int(datetime.now().timestamp()),
-                                        "model": payload["model"],
-                                        "choices": [{
-                                            "index": 0,
-                                            "delta": {"content": content},
-                                            "finish_reason": None
-                                        }]
-                                    })
-                        except json.JSONDecodeError:
-                            continue
+            started = time.time()
+            chunk_head = _CHUNK_JSON_HEAD % (_json_dumps(f"chatcmpl-{started}"), int(started), _json_dumps(model_id))
+            async for data_str in self._iter_sse_events(response):
+                if data_str.startswith(b"[DONE]"):
+                    break
+                
+                try:
+                    raw_text = _extract_json_string(data_str, _ANTHROPIC_TEXT_MARKER)
+                    if raw_text is not None:
+                        # Already JSON-escaped, so it goes into the chunk as is
+                        content_json = '"' + raw_text.decode("utf-8") + '"' if raw_text else None
+                    elif len(data_str) > MAX_PARSED_SSE_EVENT_BYTES:
+                        # Too big to parse per event; take the text field straight from the bytes
+                        content_json = None
+                        if b'"content_block_delta"' in data_str:
+                            raw_text = _extract_json_string(data_str, b'"text":"')
+                            if raw_text:
+                                content_json = '"' + raw_text.decode("utf-8") + '"'
+                    elif not _looks_like_json_document(data_str):
+                        content_json = None
+                    else:
+                        data = _json_loads(data_str)
+                        content_json = None
+                        if data.get("type") == "content_block_delta":
+                            content = data.get("delta", {}).get("text", "")
+                            if content:
+                                content_json = _json_dumps(content)
+                    if content_json:
+                        # Convert to OpenAI format
+                        yield chunk_head + content_json + _CHUNK_JSON_TAIL
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
     
     def track_usage(self, model_id: str, input_tokens: int, cost_per_1k: float):
         """Track usage for Stripe billing"""
-        usage_event = {
-            "timestamp": datetime.now().isoformat(),
-            "model_id": model_id,
-            "input_tokens": input_tokens,
-            "cost_per_1k": cost_per_1k,
-            "estimated_cost": (input_tokens / 1000) * cost_per_1k
-        }
+        self._pending_usage.append((time.time(), model_id, input_tokens, cost_per_1k))
         
-        self.billing_events.append(usage_event)
-        
-        # Update running stats
-        if model_id not in self.usage_stats:
-            self.usage_stats[model_id] = {
-                "total_requests": 0,
-                "total_tokens": 0,
-                "total_cost": 0.0
-            }
+        if self._usage_flusher is None or self._usage_flusher.done():
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                # No event loop to run the flusher on, so aggregate right away
+                self._flush_usage()
+                return
+            self._usage_flusher = loop.create_task(self._run_usage_flusher())
+    
+    async def _run_usage_flusher(self):
+        """Aggregate queued usage periodically, stopping once no new usage arrives"""
+        while True:
+            await asyncio.sleep(USAGE_FLUSH_INTERVAL)
+            if not self._flush_usage():
+                return
+    
+    def _flush_usage(self) -> int:
+        """Turn queued usage into billing events and running stats; returns the number flushed"""
+        pending = self._pending_usage
+        flushed = 0
+        flushed_tokens = 0
+        flushed_cost = 0.0
         
-        self.usage_stats[model_id]["total_requests"] += 1
-        self.usage_stats[model_id]["total_tokens"] += input_tokens
-        self.usage_stats[model_id]["total_cost"] += usage_event["estimated_cost"]
+        while pending:
+            timestamp, model_id, input_tokens, cost_per_1k = pending.popleft()
+            estimated_cost = (input_tokens / 1000) * cost_per_1k
+            
+            self.billing_events.append({
+                "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+                "model_id": model_id,
+                "input_tokens": input_tokens,
+                "cost_per_1k": cost_per_1k,
+                "estimated_cost": estimated_cost
+            })
+            
+            # Update running stats
+            model_stats = self.usage_stats.get(model_id)
+            if model_stats is None:
+                model_stats = self.usage_stats[model_id] = {
+                    "total_requests": 0,
+                    "total_tokens": 0,
+                    "total_cost": 0.0
+                }
+            
+            for stats in (model_stats, self._usage_totals):
+                stats["total_requests"] += 1
+                stats["total_tokens"] += input_tokens
+                stats["total_cost"] += estimated_cost
+            
+            flushed += 1
+            flushed_tokens += input_tokens
+            flushed_cost += estimated_cost
         
-        logger.info(f"Usage tracked: {model_id} - {input_tokens} tokens - ${usage_event['estimated_cost']:.4f}")
+        if flushed and logger.isEnabledFor(logging.INFO):
+            logger.info("Usage tracked: %d calls - %d tokens - $%.4f", flushed, flushed_tokens, flushed_cost)
+        return flushed
     
     def get_usage_stats(self) -> Dict:
         """Get usage statistics for billing"""
+        self._flush_usage()
         return {
             "usage_by_model": self.usage_stats,
-            "recent_events": self.billing_events[-100:],  # Last 100 events
-            "total_cost": sum(stats["total_cost"] for stats in self.usage_stats.values()),
-            "total_requests": sum(stats["total_requests"] for stats in self.usage_stats.values()),
-            "total_tokens": sum(stats["total_tokens"] for stats in self.usage_stats.values())
+            "recent_events": self._recent_billing_events(100),  # Last 100 events
+            **self._usage_totals
         }
+    
+    def _recent_billing_events(self, count: int) -> List[Dict]:
+        """Last count billing events, oldest first, without copying the whole deque"""
+        recent = list(islice(reversed(self.billing_events), count))
+        recent.reverse()
+        return recent
 
 # Global instance
 enhanced_router = EnhancedModelRouter()
\ No newline at end of file
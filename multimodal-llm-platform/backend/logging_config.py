@@ -6,15 +6,20 @@ Implements structured logging, error tracking, and observability
 
 import os
 import sys
+import queue
+import atexit
 import json
 import time
 import asyncio
+import copy
 import logging
 import traceback
-from datetime import datetime
+from logging.handlers import QueueHandler
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from contextlib import contextmanager
+from collections import deque
+from itertools import islice
 import functools
 
 # Third-party imports for enhanced logging
@@ -26,6 +31,13 @@ except ImportError:
     STRUCTURED_LOGGING_AVAILABLE = False
     print("Warning: Advanced logging libraries not available. Using basic logging.")
 
+# Optional faster JSON serialization for log records
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configuration
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # json, text, or structured
@@ -36,6 +48,24 @@ BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
 # Ensure log directory exists
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
+# Logging is configured once per process, however many LoggingManagers are created
+_CONFIGURED = False
+_queue_listener = None
+
+# (second, formatted) pair; swapped as a whole so concurrent readers never see a torn update
+_iso_timestamp_cache = (0, "")
+
+
+def _iso_now() -> str:
+    """Current UTC time as an ISO 8601 string with second resolution, formatted once per second"""
+    global _iso_timestamp_cache
+    now = int(time.time())
+    cached_second, formatted = _iso_timestamp_cache
+    if cached_second != now:
+        formatted = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+        _iso_timestamp_cache = (now, formatted)
+    return formatted
+
 
 class CustomJSONFormatter(jsonlogger.JsonFormatter):
     """Custom JSON formatter with additional fields"""
@@ -44,7 +74,7 @@ class CustomJSONFormatter(jsonlogger.JsonFormatter):
         super().add_fields(log_record, record, message_dict)
         
         # Add timestamp
-        log_record['timestamp'] = datetime.utcnow().isoformat()
+        log_record['timestamp'] = _iso_now()
         
         # Add service information
         log_record['service'] = 'autopicker-platform'
@@ -61,6 +91,37 @@ class CustomJSONFormatter(jsonlogger.JsonFormatter):
         # Add performance metrics if available
         if hasattr(record, 'duration_ms'):
             log_record['duration_ms'] = record.duration_ms
+    
+    def jsonify_log_record(self, log_record):
+        """Serialize the record with orjson when available, else the stdlib encoder"""
+        if ORJSON_AVAILABLE and self.json_indent is None:
+            try:
+                return orjson.dumps(log_record, default=str).decode("utf-8")
+            except TypeError:
+                pass  # e.g. non-string keys in extra fields
+        return super().jsonify_log_record(log_record)
+
+
+class InProcessQueueHandler(QueueHandler):
+    """QueueHandler for a listener in the same process
+    
+    The stock prepare() formats the record and drops exc_info so it can cross a
+    process boundary; here the formatters behind the listener still need it.
+    """
+    
+    def prepare(self, record):
+        # Freeze the message now, since args may change before the listener runs
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _tail(items: deque, count: int) -> List[Any]:
+    """Last count items of a deque, oldest first, without copying the whole deque"""
+    tail = list(islice(reversed(items), count))
+    tail.reverse()
+    return tail
 
 
 class ErrorTracker:
@@ -68,8 +129,9 @@ class ErrorTracker:
     
     def __init__(self):
         self.error_counts = {}
-        self.recent_errors = []
+        self.total_errors = 0
         self.max_recent_errors = 100
+        self.recent_errors = deque(maxlen=self.max_recent_errors)
         
     def track_error(self, error: Exception, context: Dict[str, Any] = None):
         """Track an error occurrence"""
@@ -78,21 +140,18 @@ class ErrorTracker:
         
         # Count errors by type
         self.error_counts[error_type] = self.error_counts.get(error_type, 0) + 1
+        self.total_errors += 1
         
-        # Store recent error
+        # Store recent error (outside an except block there is no traceback to format)
         error_info = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': _iso_now(),
             'type': error_type,
             'message': error_message,
-            'traceback': traceback.format_exc(),
+            'traceback': traceback.format_exc() if sys.exc_info()[0] is not None else None,
             'context': context or {}
         }
         
-        self.recent_errors.append(error_info)
-        
-        # Limit recent errors list
-        if len(self.recent_errors) > self.max_recent_errors:
-            self.recent_errors.pop(0)
+        self.recent_errors.append(error_info)  # Oldest error drops off once full
         
         return error_info
     
@@ -101,8 +160,8 @@ class ErrorTracker:
         return {
             'error_counts': self.error_counts,
             'recent_errors_count': len(self.recent_errors),
-            'recent_errors': self.recent_errors[-10:],  # Last 10 errors
-            'total_errors': sum(self.error_counts.values())
+            'recent_errors': _tail(self.recent_errors, 10),  # Last 10 errors
+            'total_errors': self.total_errors
         }
 
 
@@ -111,60 +170,60 @@ class PerformanceTracker:
     
     def __init__(self):
         self.metrics = {}
-        self.request_times = []
         self.max_request_times = 1000
+        self.request_times = deque(maxlen=self.max_request_times)
+        self.slow_request_threshold_ms = 1000
+        self.slow_requests = deque(maxlen=100)  # Kept as they happen, so summaries need no scan
     
     @contextmanager
     def track_time(self, operation: str, context: Dict[str, Any] = None):
         """Context manager to track operation timing"""
         start_time = time.time()
-        start_timestamp = datetime.utcnow()
+        start_timestamp = _iso_now()
         
         try:
             yield
         finally:
             duration = (time.time() - start_time) * 1000  # Convert to milliseconds
-            
-            # Track in metrics
-            if operation not in self.metrics:
-                self.metrics[operation] = {
-                    'count': 0,
-                    'total_time': 0,
-                    'min_time': float('inf'),
-                    'max_time': 0,
-                    'avg_time': 0
-                }
-            
-            metric = self.metrics[operation]
-            metric['count'] += 1
-            metric['total_time'] += duration
-            metric['min_time'] = min(metric['min_time'], duration)
-            metric['max_time'] = max(metric['max_time'], duration)
-            metric['avg_time'] = metric['total_time'] / metric['count']
-            
-            # Track request timing
-            request_info = {
-                'operation': operation,
-                'duration_ms': duration,
-                'timestamp': start_timestamp.isoformat(),
-                'context': context or {}
+            self.record_time(operation, duration, start_timestamp, context)
+    
+    def record_time(self, operation: str, duration: float, start_timestamp: str, context: Dict[str, Any] = None):
+        """Record one timed operation (duration in milliseconds)"""
+        # Track in metrics
+        if operation not in self.metrics:
+            self.metrics[operation] = {
+                'count': 0,
+                'total_time': 0,
+                'min_time': float('inf'),
+                'max_time': 0,
+                'avg_time': 0
             }
-            
-            self.request_times.append(request_info)
-            
-            # Limit request times list
-            if len(self.request_times) > self.max_request_times:
-                self.request_times.pop(0)
+        
+        metric = self.metrics[operation]
+        metric['count'] += 1
+        metric['total_time'] += duration
+        metric['min_time'] = min(metric['min_time'], duration)
+        metric['max_time'] = max(metric['max_time'], duration)
+        metric['avg_time'] = metric['total_time'] / metric['count']
+        
+        # Track request timing
+        request_info = {
+            'operation': operation,
+            'duration_ms': duration,
+            'timestamp': start_timestamp,
+            'context': context or {}
+        }
+        
+        self.request_times.append(request_info)  # Oldest timing drops off once full
+        if duration > self.slow_request_threshold_ms:
+            self.slow_requests.append(request_info)
     
     def get_performance_summary(self) -> Dict[str, Any]:
         """Get performance metrics summary"""
         return {
             'metrics': self.metrics,
             'recent_requests': len(self.request_times),
-            'slow_requests': [
-                req for req in self.request_times[-100:] 
-                if req['duration_ms'] > 1000  # Slower than 1 second
-            ]
+            'slow_requests': list(self.slow_requests)  # Last 100 slower than 1 second
         }
 
 
@@ -178,6 +237,11 @@ class LoggingManager:
     
     def setup_logging(self):
         """Setup comprehensive logging configuration"""
+        global _CONFIGURED
+        if _CONFIGURED:
+            return
+        _CONFIGURED = True
+        
         # Create formatters
         if LOG_FORMAT == "json" and STRUCTURED_LOGGING_AVAILABLE:
             formatter = CustomJSONFormatter(
@@ -211,8 +275,13 @@ class LoggingManager:
             self.setup_structured_logging()
     
     def setup_file_handlers(self, formatter):
-        """Setup rotating file handlers"""
-        from logging.handlers import RotatingFileHandler
+        """Setup rotating file handlers
+        
+        The files are written from a QueueListener thread; loggers only put records
+        on a queue, so disk I/O and formatting stay off the calling thread.
+        """
+        global _queue_listener
+        from logging.handlers import RotatingFileHandler, QueueListener
         
         # Main application log
         app_handler = RotatingFileHandler(
@@ -240,14 +309,20 @@ class LoggingManager:
         )
         perf_handler.setFormatter(formatter)
         perf_handler.setLevel(logging.INFO)
+        # Performance records reach the queue through the "autopicker" logger
+        perf_handler.addFilter(logging.Filter("autopicker.performance"))
         
         # Add handlers to loggers
+        log_queue = queue.SimpleQueue()
         app_logger = logging.getLogger("autopicker")
-        app_logger.addHandler(app_handler)
-        app_logger.addHandler(error_handler)
+        app_logger.addHandler(InProcessQueueHandler(log_queue))
         
-        perf_logger = logging.getLogger("autopicker.performance")
-        perf_logger.addHandler(perf_handler)
+        _queue_listener = QueueListener(
+            log_queue, app_handler, error_handler, perf_handler,
+            respect_handler_level=True
+        )
+        _queue_listener.start()
+        atexit.register(_queue_listener.stop)
     
     def setup_structured_logging(self):
         """Setup structured logging with structlog"""
@@ -275,9 +350,22 @@ error_tracker = logging_manager.error_tracker
 performance_tracker = logging_manager.performance_tracker
 
 
+# Loggers used by the helpers below, looked up once instead of through
+# logging.getLogger (which takes the logging module lock) on every call
+_PERF_LOGGER = logging.getLogger("autopicker.performance")
+_logger_cache: Dict[str, logging.Logger] = {}
+
+
+def _get_logger(name: str) -> logging.Logger:
+    logger = _logger_cache.get(name)
+    if logger is None:
+        logger = _logger_cache[name] = logging.getLogger(name)
+    return logger
+
+
 def log_error(error: Exception, context: Dict[str, Any] = None, logger_name: str = "autopicker"):
     """Log an error with tracking"""
-    logger = logging.getLogger(logger_name)
+    logger = _get_logger(logger_name)
     
     # Track the error
     error_info = error_tracker.track_error(error, context)
@@ -288,7 +376,7 @@ def log_error(error: Exception, context: Dict[str, Any] = None, logger_name: str
         extra={
             'error_type': type(error).__name__,
             'error_context': context or {},
-            'traceback': traceback.format_exc()
+            'traceback': error_info['traceback']  # Formatted once by track_error
         }
     )
     
@@ -297,10 +385,12 @@ def log_error(error: Exception, context: Dict[str, Any] = None, logger_name: str
 
 def log_performance(operation: str, duration_ms: float, context: Dict[str, Any] = None):
     """Log performance metrics"""
-    perf_logger = logging.getLogger("autopicker.performance")
+    # Skip building the record entirely when performance logging is switched off
+    if not _PERF_LOGGER.isEnabledFor(logging.INFO):
+        return
     
-    perf_logger.info(
-        f"Performance: {operation}",
+    _PERF_LOGGER.info(
+        "Performance: %s", operation,
         extra={
             'operation': operation,
             'duration_ms': duration_ms,
@@ -316,27 +406,28 @@ def performance_monitor(operation_name: str = None):
         if operation_name is None:
             operation_name = f"{func.__module__}.{func.__name__}"
         
+        # One timing per call feeds both the tracker and the performance log
         @functools.wraps(func)
         async def async_wrapper(*args, **kwargs):
-            with performance_tracker.track_time(operation_name):
-                start_time = time.time()
-                try:
-                    result = await func(*args, **kwargs)
-                    return result
-                finally:
-                    duration = (time.time() - start_time) * 1000
-                    log_performance(operation_name, duration)
+            start_time = time.time()
+            start_timestamp = _iso_now()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                duration = (time.time() - start_time) * 1000
+                performance_tracker.record_time(operation_name, duration, start_timestamp)
+                log_performance(operation_name, duration)
         
         @functools.wraps(func)
         def sync_wrapper(*args, **kwargs):
-            with performance_tracker.track_time(operation_name):
-                start_time = time.time()
-                try:
-                    result = func(*args, **kwargs)
-                    return result
-                finally:
-                    duration = (time.time() - start_time) * 1000
-                    log_performance(operation_name, duration)
+            start_time = time.time()
+            start_timestamp = _iso_now()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = (time.time() - start_time) * 1000
+                performance_tracker.record_time(operation_name, duration, start_timestamp)
+                log_performance(operation_name, duration)
         
         return async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
     return decorator
@@ -411,30 +502,43 @@ def get_logging_status() -> Dict[str, Any]:
     }
 
 
+def _sample_system_health() -> Dict[str, Any]:
+    """Read system metrics (blocking syscalls, so run it off the event loop)"""
+    import psutil
+    
+    # Non-blocking: CPU use since the previous call
+    cpu_percent = psutil.cpu_percent(interval=None)
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage('/')
+    
+    return {
+        'cpu_percent': cpu_percent,
+        'memory_percent': memory.percent,
+        'memory_available_gb': memory.available / (1024**3),
+        'disk_percent': disk.percent,
+        'disk_free_gb': disk.free / (1024**3),
+        'process_count': len(psutil.pids())
+    }
+
+
 async def log_system_health():
     """Background task to log system health metrics"""
     logger = logging.getLogger("autopicker.health")
     
+    # Prime the CPU counter so the first reading covers a real interval
+    try:
+        import psutil
+        psutil.cpu_percent(interval=None)
+        await asyncio.sleep(1)
+    except ImportError:
+        pass
+    
     while True:
         try:
-            import psutil
-            
             # System metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            health = await asyncio.to_thread(_sample_system_health)
             
-            logger.info(
-                "System health check",
-                extra={
-                    'cpu_percent': cpu_percent,
-                    'memory_percent': memory.percent,
-                    'memory_available_gb': memory.available / (1024**3),
-                    'disk_percent': disk.percent,
-                    'disk_free_gb': disk.free / (1024**3),
-                    'process_count': len(psutil.pids())
-                }
-            )
+            logger.info("System health check", extra=health)
             
             await asyncio.sleep(300)  # Log every 5 minutes
             
@@ -1,11 +1,20 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Depends
-from fastapi.responses import StreamingResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse, JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
 import httpx
+import multiprocessing
 import json
 import os
+import time
 import uuid
 import aiofiles
 from pathlib import Path
@@ -13,19 +22,115 @@ import logging
 from processors.file_processor import FileProcessor, FileProcessorError
 from services.search_service import SearchService, SearchResult
 from services.concurrent_processor import ConcurrentProcessor
+from services.llm_cache import LLMCache, SearchCache
 from token_manager import token_manager
 
+# Optional orjson for the JSON bodies on the chat path
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+if ORJSON_AVAILABLE:
+    _json_loads = orjson.loads
+    _json_encode = orjson.dumps
+else:
+    _json_loads = json.loads
+    
+    def _json_encode(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when it is installed
+    """
+    def render(self, content: Any) -> bytes:
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return super().render(content)
+
+class UnhandledErrorMiddleware:
+    """
+    Answer unexpected exceptions with a 500 JSON response. Unlike an exception
+    handler for Exception, which Starlette runs outside CORSMiddleware, this sits
+    inside it, so the frontends still get CORS headers and can read the error.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        response_started = False
+        
+        async def send_wrapper(message: Message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            # Once headers are out (e.g. mid-stream) there is no response left to replace
+            if response_started:
+                raise
+            logger.exception("Unhandled error on %s %s", scope["method"], scope["path"])
+            response = FastJSONResponse(status_code=500, content={"detail": str(exc)})
+            await response(scope, receive, send)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan events"""
+    # Startup: one pooled client for all LiteLLM traffic so connections are reused
+    app.state.http = httpx.AsyncClient(
+        timeout=60.0,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=1000,
+            max_keepalive_connections=100,
+            keepalive_expiry=30.0
+        )
+    )
+    # CPU-bound document extraction runs in worker processes, started on first use
+    app.state.cpu_pool = None
+    await llm_cache.connect()
+    search_cache.share_redis(llm_cache)
+    
+    # Index uploaded files by ID once instead of scanning UPLOAD_DIR per lookup.
+    # Stored names are f"{uuid}{suffix}" with a single suffix, so the stem is the ID.
+    app.state.file_index = {
+        path.stem: path
+        for path in UPLOAD_DIR.iterdir() if path.is_file()
+    }
+    
+    yield
+    
+    # Shutdown
+    await app.state.http.aclose()
+    if app.state.cpu_pool is not None:
+        app.state.cpu_pool.shutdown(wait=False, cancel_futures=True)
+    await llm_cache.aclose()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Multimodal LLM Platform API",
     description="A comprehensive API for processing multimodal content using various LLM providers",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
+# Unexpected errors become 500s here, inside CORS, so they keep the CORS headers
+app.add_middleware(UnhandledErrorMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -39,12 +144,43 @@ app.add_middleware(
 LITELLM_PROXY_URL = os.getenv("LITELLM_PROXY_URL", "http://localhost:8000")
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB per read when copying uploads to disk
+# Uploads at least this large are dropped from the page cache once written
+UPLOAD_FADVISE_MIN_BYTES = 64 << 20
+SSE_PING_INTERVAL = 15.0  # seconds of upstream silence before a keep-alive comment
+SSE_PING = b": ping\n\n"
+MODELS_CACHE_TTL = 60.0  # seconds the LiteLLM model list is served from memory
+
+# Fallback model list when LiteLLM has never answered
+DEFAULT_MODELS = {
+    "object": "list",
+    "data": [
+        {"id": "gpt-3.5-turbo", "object": "model"},
+        {"id": "gpt-4", "object": "model"},
+        {"id": "claude-3-sonnet", "object": "model"},
+        {"id": "claude-3-haiku", "object": "model"}
+    ]
+}
+
+# (fetched_at, response) of the last successful /v1/models call
+_models_cache: Optional[tuple] = None
+
+# System prompts built from file content, keyed by (file path, mtime, size, char budget),
+# so each turn of a multi-turn file chat does not re-slice and re-concatenate the text
+FILE_CONTEXT_CACHE_SIZE = 64
+_file_context_cache: "OrderedDict[tuple, str]" = OrderedDict()
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
 # Initialize file processor, search service, and concurrent processor
 file_processor = FileProcessor()
 search_service = SearchService()
 concurrent_processor = ConcurrentProcessor(file_processor, search_service)
 
+# Cache for deterministic (temperature=0) chat completions
+llm_cache = LLMCache(redis_url=REDIS_URL)
+# Search results share the same Redis connection pool
+search_cache = SearchCache()
+
 # Request/Response Models
 class ChatMessage(BaseModel):
     role: str  # "user", "assistant", "system"
@@ -116,11 +252,70 @@ class BatchProcessResponse(BaseModel):
     successful_files: int
     failed_files: int
 
+# Error handlers shared by all endpoints; HTTPExceptions keep FastAPI's default handling
+# and anything else unexpected is answered by UnhandledErrorMiddleware
+@app.exception_handler(httpx.RequestError)
+async def litellm_unavailable_handler(request: Request, exc: httpx.RequestError):
+    logger.error("Request error: %s", exc)
+    return FastJSONResponse(
+        status_code=503,
+        content={"detail": "LiteLLM proxy is not available. Please ensure it's running."}
+    )
+
+def _get_cpu_pool() -> ProcessPoolExecutor:
+    """Worker pool for document extraction, created on first use"""
+    if app.state.cpu_pool is None:
+        # Workers come from a fork server (or are spawned) rather than forked from
+        # this process, which has its event loop, threadpool and client threads running
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        app.state.cpu_pool = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=context)
+    return app.state.cpu_pool
+
 # Health check endpoint
+# Static body, encoded once: probes hit this endpoint far more often than anything else
+_HEALTH_BODY = _json_encode({"status": "healthy", "service": "multimodal-llm-platform"})
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "multimodal-llm-platform"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
+
+async def _forward_chat(payload: Dict[str, Any]):
+    """
+    Send a chat payload to LiteLLM, serving deterministic requests from cache
+    """
+    # Only deterministic, non-streaming completions are safe to serve from cache
+    cache_key = None
+    if payload.get("temperature") == 0 and not payload.get("stream"):
+        cache_key = LLMCache.make_key(
+            payload.get("model"), payload["messages"], payload["temperature"], payload.get("max_tokens")
+        )
+        cached = await llm_cache.get(cache_key)
+        if cached is not None:
+            return FastJSONResponse(content=cached, headers={"X-Cache": "HIT"})
+    
+    logger.debug("Forwarding request to LiteLLM: %s", payload.get('model'))
+    
+    response = await app.state.http.post(
+        f"{LITELLM_PROXY_URL}/v1/chat/completions",
+        json=payload,
+        headers={"Content-Type": "application/json"}
+    )
+    
+    if response.status_code != 200:
+        logger.error("LiteLLM error: %s - %s", response.status_code, response.text)
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=f"LiteLLM proxy error: {response.text}"
+        )
+    
+    result = _json_loads(response.content)
+    logger.debug("Successfully processed request with model: %s", result.get('model'))
+    
+    if cache_key is not None:
+        await llm_cache.set(cache_key, result)
+    return result
 
 # Chat completion endpoint
 @app.post("/api/v1/chat/completions", response_model=ChatCompletionResponse)
@@ -128,47 +323,57 @@ async def chat_completion(request: ChatCompletionRequest):
     """
     Process chat completion requests and forward to LiteLLM proxy
     """
+    # pydantic-core serializes the validated request directly; unset optionals are dropped
+    payload = request.model_dump(mode="json", exclude_none=True)
+    return await _forward_chat(payload)
+
+async def _sse_with_keepalive(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Pass SSE bytes through, emitting a comment line whenever the upstream has been
+    idle for SSE_PING_INTERVAL so proxies do not drop a long-running generation.
+    Pings are only sent on an event boundary to avoid splitting a data line.
+    """
+    iterator = chunks.__aiter__()
+    at_boundary = True
+    pending = None
     try:
-        # Convert Pydantic model to dict
-        payload = {
-            "model": request.model,
-            "messages": [{"role": msg.role, "content": msg.content} for msg in request.messages],
-            "temperature": request.temperature,
-            "stream": request.stream
-        }
-        
-        if request.max_tokens:
-            payload["max_tokens"] = request.max_tokens
-        
-        logger.info(f"Forwarding request to LiteLLM: {request.model}")
-        
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{LITELLM_PROXY_URL}/v1/chat/completions",
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"LiteLLM error: {response.status_code} - {response.text}")
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"LiteLLM proxy error: {response.text}"
-                )
-            
-            result = response.json()
-            logger.info(f"Successfully processed request with model: {result.get('model')}")
-            return result
-            
-    except httpx.RequestError as e:
-        logger.error(f"Request error: {e}")
-        raise HTTPException(
-            status_code=503,
-            detail="LiteLLM proxy is not available. Please ensure it's running."
-        )
-    except Exception as e:
-        logger.error(f"Unexpected error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+            done, _ = await asyncio.wait((pending,), timeout=SSE_PING_INTERVAL)
+            if not done:
+                if at_boundary:
+                    yield SSE_PING
+                continue
+            try:
+                chunk = pending.result()
+            except StopAsyncIteration:
+                break
+            finally:
+                pending = None
+            at_boundary = chunk.endswith(b"\n\n")
+            yield chunk
+    finally:
+        if pending is not None:
+            pending.cancel()
+            await asyncio.gather(pending, return_exceptions=True)
+        await chunks.aclose()
+
+def _cacheable_search(result_dicts: List[Dict[str, Any]]) -> bool:
+    """
+    Mock fallback results stand in for an unavailable SearXNG and must not be cached
+    """
+    return all(result["engine"] != "mock" for result in result_dicts)
+
+def _resolve_file_ids(file_ids: List[str]) -> List[Path]:
+    """
+    Map file IDs to stored paths, reporting every unknown ID in a single 404
+    """
+    file_index = app.state.file_index
+    missing = [file_id for file_id in file_ids if file_id not in file_index]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"File IDs not found: {missing}")
+    return [file_index[file_id] for file_id in file_ids]
 
 # Streaming chat completion endpoint
 @app.post("/api/v1/chat/completions/stream")
@@ -176,49 +381,48 @@ async def chat_completion_stream(request: ChatCompletionRequest):
     """
     Process streaming chat completion requests
     """
-    try:
-        # Force streaming mode
-        payload = {
-            "model": request.model,
-            "messages": [{"role": msg.role, "content": msg.content} for msg in request.messages],
-            "temperature": request.temperature,
-            "stream": True
-        }
-        
-        if request.max_tokens:
-            payload["max_tokens"] = request.max_tokens
-        
-        logger.info(f"Starting streaming request to LiteLLM: {request.model}")
-        
-        async def generate_stream():
-            async with httpx.AsyncClient(timeout=60.0) as client:
-                async with client.stream(
-                    "POST",
-                    f"{LITELLM_PROXY_URL}/v1/chat/completions",
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                ) as response:
-                    if response.status_code != 200:
-                        yield f"data: {json.dumps({'error': f'LiteLLM error: {response.status_code}'})}\n\n"
-                        return
-                    
-                    async for chunk in response.aiter_text():
-                        if chunk:
-                            yield chunk
-        
-        return StreamingResponse(
-            generate_stream(),
-            media_type="text/plain",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "Content-Type": "text/event-stream",
-            }
-        )
-        
-    except Exception as e:
-        logger.error(f"Streaming error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Force streaming mode
+    payload = request.model_dump(mode="json", exclude_none=True)
+    payload["stream"] = True
+    
+    logger.debug("Starting streaming request to LiteLLM: %s", request.model)
+    
+    # Send the request before returning so connection failures surface as a 503
+    # instead of an empty 200 stream
+    upstream_request = app.state.http.build_request(
+        "POST",
+        f"{LITELLM_PROXY_URL}/v1/chat/completions",
+        json=payload,
+        headers={"Content-Type": "application/json"}
+    )
+    upstream = await app.state.http.send(upstream_request, stream=True)
+    
+    async def generate_stream():
+        try:
+            if upstream.status_code != 200:
+                yield b"data: " + _json_encode({"error": f"LiteLLM error: {upstream.status_code}"}) + b"\n\n"
+                return
+            
+            # Forward the SSE bytes untouched; decoding to str only to re-encode is wasted work.
+            # No chunk_size: httpx would hold bytes back until a full chunk accumulated,
+            # delaying tokens, while each network read already returns up to 64 KiB.
+            async for chunk in upstream.aiter_bytes():
+                if chunk:
+                    yield chunk
+        finally:
+            await upstream.aclose()
+    
+    return StreamingResponse(
+        _sse_with_keepalive(generate_stream()),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+        # Also release the upstream connection if the client disconnects before streaming starts
+        background=BackgroundTask(upstream.aclose)
+    )
 
 # File upload endpoint
 @app.post("/api/v1/upload", response_model=FileUploadResponse)
@@ -226,35 +430,51 @@ async def upload_file(file: UploadFile = File(...)):
     """
     Upload and save files for processing
     """
-    try:
-        # Generate unique filename
-        file_id = str(uuid.uuid4())
-        file_extension = Path(file.filename).suffix if file.filename else ""
-        stored_filename = f"{file_id}{file_extension}"
-        file_path = UPLOAD_DIR / stored_filename
-        
-        # Save file
-        async with aiofiles.open(file_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
-        
-        # Get file size
-        file_size = len(content)
-        
-        logger.info(f"File uploaded: {file.filename} -> {stored_filename} ({file_size} bytes)")
-        
-        return FileUploadResponse(
-            id=file_id,
-            filename=stored_filename,
-            original_filename=file.filename or "unknown",
-            size=file_size,
-            mime_type=file.content_type or "application/octet-stream",
-            upload_path=str(file_path)
-        )
-        
-    except Exception as e:
-        logger.error(f"File upload error: {e}")
-        raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
+    # Generate unique filename
+    file_id = str(uuid.uuid4())
+    file_extension = Path(file.filename).suffix if file.filename else ""
+    stored_filename = f"{file_id}{file_extension}"
+    file_path = UPLOAD_DIR / stored_filename
+    
+    # Save file in fixed-size chunks so the upload is never fully buffered in memory
+    file_size = 0
+    async with aiofiles.open(file_path, 'wb') as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            file_size += len(chunk)
+            await f.write(chunk)
+        
+        # Keep large uploads from evicting hot pages; Linux-only and best effort
+        if file_size >= UPLOAD_FADVISE_MIN_BYTES and hasattr(os, "posix_fadvise"):
+            await f.flush()
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    app.state.file_index[file_id] = file_path
+    
+    logger.info("File uploaded: %s -> %s (%s bytes)", file.filename, stored_filename, file_size)
+    
+    return FileUploadResponse(
+        id=file_id,
+        filename=stored_filename,
+        original_filename=file.filename or "unknown",
+        size=file_size,
+        mime_type=file.content_type or "application/octet-stream",
+        upload_path=str(file_path)
+    )
+
+def _scan_upload_dir() -> List[Dict[str, Any]]:
+    """
+    Describe every uploaded file in a single scandir pass; DirEntry caches its
+    type and stat results, saving a syscall per entry over iterdir()
+    """
+    with os.scandir(UPLOAD_DIR) as entries:
+        return [
+            {
+                "filename": entry.name,
+                "size": (stat := entry.stat()).st_size,
+                "created_at": stat.st_ctime,
+                "path": entry.path
+            }
+            for entry in entries if entry.is_file(follow_symlinks=False)
+        ]
 
 # List uploaded files
 @app.get("/api/v1/files")
@@ -262,23 +482,10 @@ async def list_files():
     """
     List all uploaded files
     """
-    try:
-        files = []
-        for file_path in UPLOAD_DIR.iterdir():
-            if file_path.is_file():
-                stat = file_path.stat()
-                files.append({
-                    "filename": file_path.name,
-                    "size": stat.st_size,
-                    "created_at": stat.st_ctime,
-                    "path": str(file_path)
-                })
-        
-        return {"files": files, "count": len(files)}
-        
-    except Exception as e:
-        logger.error(f"List files error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # The directory walk is blocking I/O, so run it in the threadpool
+    files = await run_in_threadpool(_scan_upload_dir)
+    
+    return {"files": files, "count": len(files)}
 
 # Get available models
 @app.get("/api/v1/models")
@@ -286,36 +493,25 @@ async def get_models():
     """
     Get list of available models from LiteLLM proxy
     """
+    global _models_cache
+    if _models_cache and time.monotonic() - _models_cache[0] < MODELS_CACHE_TTL:
+        return _models_cache[1]
+    
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{LITELLM_PROXY_URL}/v1/models")
-            
-            if response.status_code != 200:
-                # Return default models if LiteLLM is not available
-                return {
-                    "object": "list",
-                    "data": [
-                        {"id": "gpt-3.5-turbo", "object": "model"},
-                        {"id": "gpt-4", "object": "model"},
-                        {"id": "claude-3-sonnet", "object": "model"},
-                        {"id": "claude-3-haiku", "object": "model"}
-                    ]
-                }
-            
-            return response.json()
+        response = await app.state.http.get(f"{LITELLM_PROXY_URL}/v1/models")
+        
+        if response.status_code != 200:
+            # Serve the last known-good list, or the defaults if LiteLLM never answered
+            return _models_cache[1] if _models_cache else DEFAULT_MODELS
+        
+        result = response.json()
+        _models_cache = (time.monotonic(), result)
+        return result
             
     except Exception as e:
-        logger.error(f"Models endpoint error: {e}")
-        # Return default models on error
-        return {
-            "object": "list",
-            "data": [
-                {"id": "gpt-3.5-turbo", "object": "model"},
-                {"id": "gpt-4", "object": "model"},
-                {"id": "claude-3-sonnet", "object": "model"},
-                {"id": "claude-3-haiku", "object": "model"}
-            ]
-        }
+        logger.error("Models endpoint error: %s", e)
+        # Return the last known-good or default models on error
+        return _models_cache[1] if _models_cache else DEFAULT_MODELS
 
 # Process uploaded file
 @app.post("/api/v1/files/{file_id}/process", response_model=FileProcessResponse)
@@ -323,51 +519,40 @@ async def process_uploaded_file(file_id: str):
     """
     Process an uploaded file and extract content
     """
-    try:
-        # Find the file by ID (look for files starting with the ID)
-        file_path = None
-        for uploaded_file in UPLOAD_DIR.iterdir():
-            if uploaded_file.name.startswith(file_id):
-                file_path = uploaded_file
-                break
-        
-        if not file_path:
-            raise HTTPException(status_code=404, detail=f"File with ID {file_id} not found")
-        
-        # Check if file type is supported
-        if not file_processor.is_supported(file_path):
-            file_type = file_processor.get_file_type(file_path)
-            raise HTTPException(
-                status_code=422, 
-                detail=f"File type {file_type} is not supported for processing"
-            )
-        
-        # Process the file
-        result = file_processor.process_file(file_path)
-        
-        if result['processing_status'] == 'success':
-            summary = file_processor.get_file_summary(result)
-            logger.info(f"Successfully processed file {file_id}: {summary}")
-            
-            return FileProcessResponse(
-                file_id=file_id,
-                processing_status='success',
-                content=result['content'],
-                summary=summary
-            )
-        else:
-            logger.error(f"Failed to process file {file_id}: {result.get('error')}")
-            return FileProcessResponse(
-                file_id=file_id,
-                processing_status='error',
-                error=result.get('error')
-            )
-            
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"File processing error: {e}")
-        raise HTTPException(status_code=500, detail=f"File processing failed: {str(e)}")
+    # Find the file by ID (look for files starting with the ID)
+    file_path = app.state.file_index.get(file_id)
+    
+    if not file_path:
+        raise HTTPException(status_code=404, detail=f"File with ID {file_id} not found")
+    
+    # Check if file type is supported
+    if not file_processor.is_supported(file_path):
+        file_type = file_processor.get_file_type(file_path)
+        raise HTTPException(
+            status_code=422, 
+            detail=f"File type {file_type} is not supported for processing"
+        )
+    
+    # Process the file
+    result = await file_processor.process_file_async(file_path, _get_cpu_pool())
+    
+    if result['processing_status'] == 'success':
+        summary = file_processor.get_file_summary(result)
+        logger.info("Successfully processed file %s: %s", file_id, summary)
+        
+        return FileProcessResponse(
+            file_id=file_id,
+            processing_status='success',
+            content=result['content'],
+            summary=summary
+        )
+    else:
+        logger.error("Failed to process file %s: %s", file_id, result.get('error'))
+        return FileProcessResponse(
+            file_id=file_id,
+            processing_status='error',
+            error=result.get('error')
+        )
 
 # Get file processing status
 @app.get("/api/v1/files/{file_id}/process")
@@ -375,34 +560,23 @@ async def get_file_process_status(file_id: str):
     """
     Get the processing status of a file
     """
-    try:
-        # Find the file by ID
-        file_path = None
-        for uploaded_file in UPLOAD_DIR.iterdir():
-            if uploaded_file.name.startswith(file_id):
-                file_path = uploaded_file
-                break
-        
-        if not file_path:
-            raise HTTPException(status_code=404, detail=f"File with ID {file_id} not found")
-        
-        # Check if file is supported
-        is_supported = file_processor.is_supported(file_path)
-        file_type = file_processor.get_file_type(file_path)
-        
-        return {
-            "file_id": file_id,
-            "file_name": file_path.name,
-            "file_type": file_type,
-            "is_supported": is_supported,
-            "supported_types": file_processor.get_supported_types()
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"File status error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Find the file by ID
+    file_path = app.state.file_index.get(file_id)
+    
+    if not file_path:
+        raise HTTPException(status_code=404, detail=f"File with ID {file_id} not found")
+    
+    # Check if file is supported
+    is_supported = file_processor.is_supported(file_path)
+    file_type = file_processor.get_file_type(file_path)
+    
+    return {
+        "file_id": file_id,
+        "file_name": file_path.name,
+        "file_type": file_type,
+        "is_supported": is_supported,
+        "supported_types": file_processor.get_supported_types()
+    }
 
 # Get supported file types
 @app.get("/api/v1/files/supported-types")
@@ -421,47 +595,45 @@ async def chat_with_file(file_id: str, request: ChatCompletionRequest):
     """
     Process a file and use its content in a chat completion
     """
-    try:
-        # Find and process the file
-        file_path = None
-        for uploaded_file in UPLOAD_DIR.iterdir():
-            if uploaded_file.name.startswith(file_id):
-                file_path = uploaded_file
-                break
-        
-        if not file_path:
-            raise HTTPException(status_code=404, detail=f"File with ID {file_id} not found")
-        
-        # Process the file
-        result = file_processor.process_file(file_path)
-        
-        if result['processing_status'] != 'success':
-            raise HTTPException(
-                status_code=422, 
-                detail=f"File processing failed: {result.get('error')}"
-            )
-        
-        # Get the extracted text content
-        file_content = result['content']
-        extracted_text = file_content.get('text', '')
-        
-        if not extracted_text:
-            raise HTTPException(
-                status_code=422,
-                detail="No text content could be extracted from the file"
-            )
-        
+    # Find and process the file
+    file_path = app.state.file_index.get(file_id)
+    
+    if not file_path:
+        raise HTTPException(status_code=404, detail=f"File with ID {file_id} not found")
+    
+    # Process the file
+    result = await file_processor.process_file_async(file_path, _get_cpu_pool())
+    
+    if result['processing_status'] != 'success':
+        raise HTTPException(
+            status_code=422, 
+            detail=f"File processing failed: {result.get('error')}"
+        )
+    
+    # Get the extracted text content
+    file_content = result['content']
+    extracted_text = file_content.get('text', '')
+    
+    if not extracted_text:
+        raise HTTPException(
+            status_code=422,
+            detail="No text content could be extracted from the file"
+        )
+    
+    # Get the model's token budget
+    model_name = request.model or "gpt-3.5-turbo"
+    token_budget = token_manager.create_token_budget(model_name)
+    
+    # Calculate how much text we can include (rough estimate: 4 chars per token)
+    # Reserve some tokens for the file summary and formatting
+    available_chars = (token_budget.file_content - 100) * 4
+    
+    cache_key = (result['file_path'], result['processed_at'], result['file_size'], available_chars)
+    system_content = _file_context_cache.get(cache_key)
+    if system_content is None:
         # Create a system message with file content using intelligent token management
         file_summary = file_processor.get_file_summary(result)
         
-        # Get the model's token budget
-        model_name = request.model or "gpt-3.5-turbo"
-        token_budget = token_manager.create_token_budget(model_name)
-        
-        # Calculate how much text we can include (rough estimate: 4 chars per token)
-        # Reserve some tokens for the file summary and formatting
-        available_chars = (token_budget.file_content - 100) * 4
-        
         # Use intelligent truncation if needed
         if len(extracted_text) <= available_chars:
             # File fits within budget - use full content
@@ -471,33 +643,23 @@ async def chat_with_file(file_id: str, request: ChatCompletionRequest):
             # Need to truncate - but now based on actual model capacity
             file_text = extracted_text[:available_chars]
             truncation_note = f"\n\n[Note: File content truncated from {len(extracted_text)} to {available_chars} characters to fit model context window]"
-            logger.info(f"Truncated file content from {len(extracted_text)} to {available_chars} chars for model {model_name}")
-        
-        system_message = ChatMessage(
-            role="system",
-            content=f"You are analyzing the following file: {file_summary}\n\nFile content:\n{file_text}{truncation_note}"
-        )
-        
-        # Prepend system message to the conversation
-        messages = [system_message] + request.messages
-        
-        # Create new request with file context
-        chat_request = ChatCompletionRequest(
-            messages=messages,
-            model=request.model,
-            temperature=request.temperature,
-            max_tokens=request.max_tokens,
-            stream=request.stream
-        )
-        
-        # Forward to chat completion endpoint
-        return await chat_completion(chat_request)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"File chat error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+            logger.info("Truncated file content from %s to %s chars for model %s", len(extracted_text), available_chars, model_name)
+        
+        system_content = f"You are analyzing the following file: {file_summary}\n\nFile content:\n{file_text}{truncation_note}"
+        _file_context_cache[cache_key] = system_content
+        if len(_file_context_cache) > FILE_CONTEXT_CACHE_SIZE:
+            _file_context_cache.popitem(last=False)
+    else:
+        _file_context_cache.move_to_end(cache_key)
+    
+    system_message = {"role": "system", "content": system_content}
+    
+    # Prepend system message to the already-validated conversation
+    payload = request.model_dump(mode="json", exclude_none=True)
+    payload["messages"] = [system_message, *payload["messages"]]
+    
+    # Forward to LiteLLM the same way the chat completion endpoint does
+    return await _forward_chat(payload)
 
 # Web search endpoint
 @app.post("/api/v1/search", response_model=SearchResponse)
@@ -505,35 +667,44 @@ async def web_search(request: SearchRequest):
     """
     Perform web search using SearXNG or fallback to mock search
     """
-    try:
-        import time
-        start_time = time.time()
-        
-        # Perform search
-        results = await search_service.search(
-            query=request.query,
-            num_results=request.num_results,
-            engines=request.engines
-        )
-        
-        # Calculate search time
-        search_time = int((time.time() - start_time) * 1000)
-        
-        # Convert results to dict format
-        result_dicts = [result.to_dict() for result in results]
-        
-        logger.info(f"Search completed: {len(results)} results for '{request.query}' in {search_time}ms")
-        
-        return SearchResponse(
+    # Monotonic integer clock: immune to wall-clock jumps, no float math
+    start_ns = time.perf_counter_ns()
+    
+    cache_key = SearchCache.make_key(request.query, request.engines, request.num_results)
+    cached = await search_cache.get(cache_key)
+    if cached is not None:
+        search_time = (time.perf_counter_ns() - start_ns) // 1_000_000
+        response = SearchResponse(
             query=request.query,
-            results=result_dicts,
-            total_results=len(results),
+            results=cached,
+            total_results=len(cached),
             search_time_ms=search_time
         )
-        
-    except Exception as e:
-        logger.error(f"Search error: {e}")
-        raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
+        return FastJSONResponse(content=response.model_dump(), headers={"X-Cache": "HIT"})
+    
+    # Perform search
+    results = await search_service.search(
+        query=request.query,
+        num_results=request.num_results,
+        engines=request.engines
+    )
+    
+    # Calculate search time
+    search_time = (time.perf_counter_ns() - start_ns) // 1_000_000
+    
+    # Convert results to dict format
+    result_dicts = [result.to_dict() for result in results]
+    if _cacheable_search(result_dicts):
+        await search_cache.set(cache_key, result_dicts)
+    
+    logger.info("Search completed: %s results for '%s' in %sms", len(results), request.query, search_time)
+    
+    return SearchResponse(
+        query=request.query,
+        results=result_dicts,
+        total_results=len(results),
+        search_time_ms=search_time
+    )
 
 # Check search service status
 @app.get("/api/v1/search/status")
@@ -552,7 +723,7 @@ async def search_status():
         }
         
     except Exception as e:
-        logger.error(f"Search status error: {e}")
+        logger.error("Search status error: %s", e)
         return {
             "searxng_available": False,
             "searxng_url": search_service.searxng_url,
@@ -567,31 +738,30 @@ async def search_with_context(file_id: str, request: SearchRequest):
     """
     Perform web search enhanced with file content context
     """
-    try:
-        # Find and process the file
-        file_path = None
-        for uploaded_file in UPLOAD_DIR.iterdir():
-            if uploaded_file.name.startswith(file_id):
-                file_path = uploaded_file
-                break
-        
-        if not file_path:
-            raise HTTPException(status_code=404, detail=f"File with ID {file_id} not found")
-        
-        # Process the file to get context
-        result = file_processor.process_file(file_path)
-        
-        if result['processing_status'] != 'success':
-            raise HTTPException(
-                status_code=422, 
-                detail=f"File processing failed: {result.get('error')}"
-            )
-        
-        # Extract context from file
-        file_content = result['content']
-        context = file_content.get('text', '')[:500]  # First 500 chars as context
-        
-        # Perform enhanced search
+    # Find and process the file
+    file_path = app.state.file_index.get(file_id)
+    
+    if not file_path:
+        raise HTTPException(status_code=404, detail=f"File with ID {file_id} not found")
+    
+    # Process the file to get context
+    result = await file_processor.process_file_async(file_path, _get_cpu_pool())
+    
+    if result['processing_status'] != 'success':
+        raise HTTPException(
+            status_code=422, 
+            detail=f"File processing failed: {result.get('error')}"
+        )
+    
+    # Extract context from file
+    context = result['text_preview']  # First 500 chars as context
+    
+    # Perform enhanced search, reusing a cached answer for the same query and context
+    cache_key = SearchCache.make_key(request.query, None, request.num_results, context)
+    result_dicts = await search_cache.get(cache_key)
+    cache_status = "HIT"
+    if result_dicts is None:
+        cache_status = "MISS"
         search_results = await search_service.search_with_context(
             query=request.query,
             context=context,
@@ -600,19 +770,18 @@ async def search_with_context(file_id: str, request: SearchRequest):
         
         # Convert results to dict format
         result_dicts = [result.to_dict() for result in search_results]
-        
-        return {
+        if _cacheable_search(result_dicts):
+            await search_cache.set(cache_key, result_dicts)
+    
+    return FastJSONResponse(
+        content={
             "query": request.query,
             "context_file": file_path.name,
             "results": result_dicts,
-            "total_results": len(search_results)
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Context search error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+            "total_results": len(result_dicts)
+        },
+        headers={"X-Cache": cache_status}
+    )
 
 # Concurrent processing endpoint
 @app.post("/api/v1/process/concurrent", response_model=ConcurrentProcessResponse)
@@ -620,37 +789,19 @@ async def concurrent_process_files_and_search(request: ConcurrentProcessRequest)
     """
     Process multiple files and perform web search concurrently
     """
-    try:
-        # Find file paths from IDs
-        file_paths = []
-        for file_id in request.file_ids:
-            file_path = None
-            for uploaded_file in UPLOAD_DIR.iterdir():
-                if uploaded_file.name.startswith(file_id):
-                    file_path = uploaded_file
-                    break
-            
-            if not file_path:
-                raise HTTPException(status_code=404, detail=f"File with ID {file_id} not found")
-            
-            file_paths.append(file_path)
-        
-        # Perform concurrent processing
-        result = await concurrent_processor.process_with_search(
-            file_paths=file_paths,
-            query=request.query,
-            num_results=request.num_results
-        )
-        
-        logger.info(f"Concurrent processing completed: {len(file_paths)} files + search for '{request.query}'")
-        
-        return ConcurrentProcessResponse(**result)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Concurrent processing error: {e}")
-        raise HTTPException(status_code=500, detail=f"Concurrent processing failed: {str(e)}")
+    # Find file paths from IDs
+    file_paths = _resolve_file_ids(request.file_ids)
+    
+    # Perform concurrent processing
+    result = await concurrent_processor.process_with_search(
+        file_paths=file_paths,
+        query=request.query,
+        num_results=request.num_results
+    )
+    
+    logger.info("Concurrent processing completed: %s files + search for '%s'", len(file_paths), request.query)
+    
+    return ConcurrentProcessResponse(**result)
 
 # Context-enhanced concurrent processing
 @app.post("/api/v1/process/concurrent-context")
@@ -658,37 +809,19 @@ async def concurrent_process_with_context(request: ConcurrentProcessRequest):
     """
     Process files and perform context-enhanced searches concurrently
     """
-    try:
-        # Find file paths from IDs
-        file_paths = []
-        for file_id in request.file_ids:
-            file_path = None
-            for uploaded_file in UPLOAD_DIR.iterdir():
-                if uploaded_file.name.startswith(file_id):
-                    file_path = uploaded_file
-                    break
-            
-            if not file_path:
-                raise HTTPException(status_code=404, detail=f"File with ID {file_id} not found")
-            
-            file_paths.append(file_path)
-        
-        # Perform context-enhanced concurrent processing
-        result = await concurrent_processor.process_files_with_context_search(
-            file_paths=file_paths,
-            base_query=request.query,
-            num_results=request.num_results
-        )
-        
-        logger.info(f"Context-enhanced concurrent processing completed: {len(file_paths)} files")
-        
-        return result
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Context-enhanced concurrent processing error: {e}")
-        raise HTTPException(status_code=500, detail=f"Context-enhanced processing failed: {str(e)}")
+    # Find file paths from IDs
+    file_paths = _resolve_file_ids(request.file_ids)
+    
+    # Perform context-enhanced concurrent processing
+    result = await concurrent_processor.process_files_with_context_search(
+        file_paths=file_paths,
+        base_query=request.query,
+        num_results=request.num_results
+    )
+    
+    logger.info("Context-enhanced concurrent processing completed: %s files", len(file_paths))
+    
+    return result
 
 # Batch processing endpoint
 @app.post("/api/v1/process/batch", response_model=BatchProcessResponse)
@@ -696,77 +829,62 @@ async def batch_process_files(request: BatchProcessRequest):
     """
     Process multiple files in batches to avoid system overload
     """
-    try:
-        # Find file paths from IDs
-        file_paths = []
-        for file_id in request.file_ids:
-            file_path = None
-            for uploaded_file in UPLOAD_DIR.iterdir():
-                if uploaded_file.name.startswith(file_id):
-                    file_path = uploaded_file
-                    break
-            
-            if not file_path:
-                raise HTTPException(status_code=404, detail=f"File with ID {file_id} not found")
-            
-            file_paths.append(file_path)
-        
-        # Perform batch processing
-        results = await concurrent_processor.batch_process_files(
-            file_paths=file_paths,
-            batch_size=request.batch_size
-        )
-        
-        # Calculate statistics
-        successful_files = len([r for r in results if r.get('status') == 'success'])
-        failed_files = len(results) - successful_files
-        
-        logger.info(f"Batch processing completed: {successful_files}/{len(results)} files successful")
-        
-        return BatchProcessResponse(
-            results=results,
-            total_files=len(results),
-            successful_files=successful_files,
-            failed_files=failed_files
-        )
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Batch processing error: {e}")
-        raise HTTPException(status_code=500, detail=f"Batch processing failed: {str(e)}")
+    # Find file paths from IDs
+    file_paths = _resolve_file_ids(request.file_ids)
+    
+    # Perform batch processing
+    results = await concurrent_processor.batch_process_files(
+        file_paths=file_paths,
+        batch_size=request.batch_size
+    )
+    
+    # Calculate statistics
+    successful_files = len([r for r in results if r.get('status') == 'success'])
+    failed_files = len(results) - successful_files
+    
+    logger.info("Batch processing completed: %s/%s files successful", successful_files, len(results))
+    
+    return BatchProcessResponse(
+        results=results,
+        total_files=len(results),
+        successful_files=successful_files,
+        failed_files=failed_files
+    )
 
 # Root endpoint
+# The API description is static, so it is encoded once at import
+_ROOT_BODY = _json_encode({
+    "service": "Multimodal LLM Platform API",
+    "version": "1.0.0",
+    "description": "A comprehensive API for processing multimodal content using various LLM providers",
+    "endpoints": {
+        "health": "/health",
+        "chat": "/api/v1/chat/completions",
+        "chat_stream": "/api/v1/chat/completions/stream", 
+        "upload": "/api/v1/upload",
+        "files": "/api/v1/files",
+        "models": "/api/v1/models",
+        "file_process": "/api/v1/files/{file_id}/process",
+        "file_status": "/api/v1/files/{file_id}/process",
+        "file_chat": "/api/v1/files/{file_id}/chat",
+        "supported_types": "/api/v1/files/supported-types",
+        "search": "/api/v1/search",
+        "search_status": "/api/v1/search/status",
+        "search_with_context": "/api/v1/search/with-context",
+        "concurrent_process": "/api/v1/process/concurrent",
+        "concurrent_context": "/api/v1/process/concurrent-context",
+        "batch_process": "/api/v1/process/batch"
+    },
+    "docs": "/docs",
+    "redoc": "/redoc"
+})
+
 @app.get("/")
 async def root():
     """
     Root endpoint with API information
     """
-    return {
-        "service": "Multimodal LLM Platform API",
-        "version": "1.0.0",
-        "description": "A comprehensive API for processing multimodal content using various LLM providers",
-        "endpoints": {
-            "health": "/health",
-            "chat": "/api/v1/chat/completions",
-            "chat_stream": "/api/v1/chat/completions/stream", 
-            "upload": "/api/v1/upload",
-            "files": "/api/v1/files",
-            "models": "/api/v1/models",
-            "file_process": "/api/v1/files/{file_id}/process",
-            "file_status": "/api/v1/files/{file_id}/process",
-            "file_chat": "/api/v1/files/{file_id}/chat",
-            "supported_types": "/api/v1/files/supported-types",
-            "search": "/api/v1/search",
-            "search_status": "/api/v1/search/status",
-            "search_with_context": "/api/v1/search/with-context",
-            "concurrent_process": "/api/v1/process/concurrent",
-            "concurrent_context": "/api/v1/process/concurrent-context",
-            "batch_process": "/api/v1/process/batch"
-        },
-        "docs": "/docs",
-        "redoc": "/redoc"
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 if __name__ == "__main__":
     import uvicorn
@@ -13,12 +13,19 @@ import psutil
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 import aiofiles
 import httpx
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+
+# Optional orjson for the metrics history file
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 # Configure logging
@@ -35,6 +42,111 @@ logger = logging.getLogger(__name__)
 # Monitoring router for FastAPI
 router = APIRouter(prefix="/api/v1/monitoring", tags=["monitoring"])
 
+if ORJSON_AVAILABLE:
+    _json_loads = orjson.loads
+    
+    def _json_encode(obj: Any) -> bytes:
+        # datetimes are serialized natively; default=str only catches anything else
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+else:
+    _json_loads = json.loads
+    
+    def _json_encode(obj: Any) -> bytes:
+        # Compact separators so history lines share orjson's timestamp prefix
+        return json.dumps(obj, default=str, separators=(",", ":")).encode("utf-8")
+
+# Seconds a sample is reused; concurrent callers within the window share one collection
+SYSTEM_METRICS_TTL = float(os.getenv("MONITORING_METRICS_TTL", "5.0"))
+API_HEALTH_TTL = 10.0
+OLLAMA_HEALTH_TTL = 10.0
+
+# CPU readings over a shorter window than this are too coarse to trust (a few
+# jiffies read as 0% or 100%), so the previous reading is reported instead
+MIN_CPU_SAMPLE_SECONDS = 0.5
+
+# Metrics history is an append-only JSONL file trimmed out-of-band
+HISTORY_RETENTION = timedelta(hours=24)
+HISTORY_ROTATE_INTERVAL = 3600  # seconds
+_TIMESTAMP_PREFIX = b'{"timestamp":"'
+
+# Alert message templates, keyed by alert type
+ALERT_MESSAGES = {
+    "cpu_high": "CPU usage is {:.1f}%",
+    "memory_high": "Memory usage is {:.1f}%",
+    "disk_full": "Disk usage is {:.1f}%",
+}
+
+IS_LINUX = platform.system() == "Linux"
+_SOCKSTAT_FILES = ("/proc/net/sockstat", "/proc/net/sockstat6")
+_INET_PROTOCOLS = (b"TCP:", b"UDP:", b"TCP6:", b"UDP6:")
+
+
+def _entry_timestamp(line: bytes) -> str:
+    """Return the ISO timestamp of a history line, reading only its prefix when possible"""
+    if line.startswith(_TIMESTAMP_PREFIX):
+        start = len(_TIMESTAMP_PREFIX)
+        end = line.find(b'"', start)
+        if end != -1:
+            return line[start:end].decode()
+    return str(_json_loads(line).get("timestamp", ""))
+
+
+def _read_proc(path: str, size: int = 8192) -> bytes:
+    """Read a small /proc file with a single read syscall"""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+def _read_meminfo() -> Tuple[int, int]:
+    """Return (total, available) memory in bytes from /proc/meminfo"""
+    total = available = 0
+    for line in _read_proc("/proc/meminfo").splitlines():
+        if line.startswith(b"MemTotal:"):
+            total = int(line.split()[1]) * 1024
+        elif line.startswith(b"MemAvailable:"):
+            available = int(line.split()[1]) * 1024
+            break
+    return total, available
+
+
+def _read_cpu_times() -> Tuple[int, int]:
+    """Return (idle, total) jiffies summed over all CPUs from the first line of /proc/stat"""
+    # b"cpu  user nice system idle iowait irq softirq steal guest guest_nice"
+    fields = _read_proc("/proc/stat", 512).split(b"\n", 1)[0].split()[1:9]
+    times = [int(value) for value in fields]
+    return times[3] + times[4], sum(times)
+
+
+def _count_processes() -> int:
+    """Count running processes without materializing a PID list"""
+    if not IS_LINUX:
+        return len(psutil.pids())
+    with os.scandir("/proc") as entries:
+        return sum(1 for entry in entries if entry.name.isdigit())
+
+
+def _count_inet_sockets() -> int:
+    """Count TCP/UDP sockets in use from the kernel's sockstat summary"""
+    if not IS_LINUX:
+        # No sockstat outside Linux; fall back to the per-socket walk
+        return len(psutil.net_connections(kind='inet'))
+    
+    total = 0
+    for path in _SOCKSTAT_FILES:
+        try:
+            content = _read_proc(path)
+        except OSError:
+            continue
+        for line in content.splitlines():
+            fields = line.split()
+            # e.g. b"TCP: inuse 10 orphan 0 tw 0 alloc 10 mem 2"
+            if fields and fields[0] in _INET_PROTOCOLS and fields[1] == b"inuse":
+                total += int(fields[2])
+    return total
+
 
 class SystemMetrics(BaseModel):
     """System resource metrics"""
@@ -70,54 +182,172 @@ class ModelMetrics(BaseModel):
     timestamp: datetime
 
 
+class SampleBundle(BaseModel):
+    """One fused sampling pass: system metrics, health checks and the alerts derived from them"""
+    timestamp: datetime
+    system: SystemMetrics
+    api_health: List[APIHealthCheck]
+    ollama_health: APIHealthCheck
+    alerts: List[Dict[str, Any]]
+
+
+# Dumps a whole list of health checks in one call instead of per model
+_health_checks_adapter = TypeAdapter(List[APIHealthCheck])
+
+
 class MonitoringService:
     """Production monitoring service"""
     
+    # (alert type, SystemMetrics field, warning above, critical at or above)
+    THRESHOLDS = [
+        ("cpu_high", "cpu_percent", 80, 90),
+        ("memory_high", "memory_percent", 85, 95),
+        ("disk_full", "disk_usage_percent", 85, 95),
+    ]
+    
     def __init__(self):
-        self.metrics_file = Path("/tmp/autopicker_metrics.json")
+        self.metrics_file = Path("/tmp/autopicker_metrics.jsonl")
         self.start_time = time.time()
+        self._last_rotate = time.monotonic()
         self.api_base_url = "http://localhost:8001"
         self.check_interval = 60  # seconds
         
-    async def get_system_metrics(self) -> SystemMetrics:
-        """Collect system resource metrics"""
-        try:
-            # CPU and memory
-            cpu_percent = psutil.cpu_percent(interval=1)
+        # Prime the CPU counter so later non-blocking reads cover a real interval;
+        # on Linux the counters come straight from /proc, elsewhere through psutil.
+        # Until a long enough interval has passed, CPU usage reads as 0
+        self._use_proc = IS_LINUX and os.path.exists("/proc/stat")
+        if self._use_proc:
+            self._cpu_snapshot = _read_cpu_times()
+        else:
+            psutil.cpu_percent(interval=None)
+        self._cpu_sampled_at = time.monotonic()
+        self._last_cpu_percent = 0.0
+        
+        # Shared pooled client for the health probes, created on first use inside the loop
+        self._client: Optional[httpx.AsyncClient] = None
+        
+        # key -> (sampled_at, value), plus one lock per key so only one caller collects
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._cache_locks: Dict[str, asyncio.Lock] = {}
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared probe client, creating it on first use"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=16)
+            )
+        return self._client
+    
+    async def close(self):
+        """Close the shared probe client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def _cached(self, key: str, ttl: float, collect: Callable[[], Awaitable[Any]]) -> Any:
+        """Return a fresh-enough cached value, or collect it once for all waiting callers"""
+        entry = self._cache.get(key)
+        if entry and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        
+        lock = self._cache_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another caller may have refreshed the entry while we waited
+            entry = self._cache.get(key)
+            if entry and time.monotonic() - entry[0] < ttl:
+                return entry[1]
+            value = await collect()
+            self._cache[key] = (time.monotonic(), value)
+            return value
+        
+    def _sample_system(self, now: datetime) -> SystemMetrics:
+        """Read all system metrics in one batch (blocking syscalls, run off the event loop)"""
+        # CPU and memory (non-blocking: usage since the previous sample)
+        cpu_percent = self._cpu_percent()
+        if self._use_proc:
+            memory_total, memory_available = _read_meminfo()
+            memory_percent = round((memory_total - memory_available) / memory_total * 100, 1)
+        else:
             memory = psutil.virtual_memory()
-            
-            # Disk usage
-            disk = psutil.disk_usage('/')
-            disk_free_gb = disk.free / (1024**3)
-            
-            # Load average (Unix systems)
-            load_avg = os.getloadavg() if hasattr(os, 'getloadavg') else [0.0, 0.0, 0.0]
-            
-            # Uptime
-            uptime_hours = (time.time() - self.start_time) / 3600
-            
-            # Process and network info
-            process_count = len(psutil.pids())
-            network_connections = len(psutil.net_connections(kind='inet'))
-            
-            return SystemMetrics(
-                timestamp=datetime.now(),
-                cpu_percent=cpu_percent,
-                memory_percent=memory.percent,
-                memory_available_gb=memory.available / (1024**3),
-                disk_usage_percent=disk.percent,
-                disk_free_gb=disk_free_gb,
-                load_average=list(load_avg),
-                uptime_hours=uptime_hours,
-                process_count=process_count,
-                network_connections=network_connections
+            memory_percent, memory_available = memory.percent, memory.available
+        
+        # Disk usage
+        disk = psutil.disk_usage('/')
+        disk_free_gb = disk.free / (1024**3)
+        
+        # Load average (Unix systems)
+        load_avg = os.getloadavg() if hasattr(os, 'getloadavg') else [0.0, 0.0, 0.0]
+        
+        # Uptime
+        uptime_hours = (time.time() - self.start_time) / 3600
+        
+        # Process and network info
+        process_count = _count_processes()
+        network_connections = _count_inet_sockets()
+        
+        return SystemMetrics(
+            timestamp=now,
+            cpu_percent=cpu_percent,
+            memory_percent=memory_percent,
+            memory_available_gb=memory_available / (1024**3),
+            disk_usage_percent=disk.percent,
+            disk_free_gb=disk_free_gb,
+            load_average=list(load_avg),
+            uptime_hours=uptime_hours,
+            process_count=process_count,
+            network_connections=network_connections
+        )
+    
+    def _cpu_percent(self) -> float:
+        """CPU usage since the previous reading, once that reading is old enough to be meaningful"""
+        sampled_at = time.monotonic()
+        if sampled_at - self._cpu_sampled_at < MIN_CPU_SAMPLE_SECONDS:
+            # Keep the old baseline so the next reading covers a longer window
+            return self._last_cpu_percent
+        
+        self._cpu_sampled_at = sampled_at
+        if self._use_proc:
+            self._last_cpu_percent = self._proc_cpu_percent()
+        else:
+            self._last_cpu_percent = psutil.cpu_percent(interval=None)
+        return self._last_cpu_percent
+    
+    def _proc_cpu_percent(self) -> float:
+        """CPU busy percentage since the previous snapshot of /proc/stat"""
+        idle, total = _read_cpu_times()
+        prev_idle, prev_total = self._cpu_snapshot
+        self._cpu_snapshot = (idle, total)
+        
+        total_delta = total - prev_total
+        if total_delta <= 0:
+            return 0.0
+        return round((total_delta - (idle - prev_idle)) / total_delta * 100, 1)
+    
+    async def get_system_metrics(self, now: Optional[datetime] = None) -> SystemMetrics:
+        """Collect system resource metrics, stamped with now when a pass supplies it"""
+        now = now or datetime.now()
+        try:
+            # One worker-thread hop for the whole batch of psutil reads
+            return await self._cached(
+                "system", SYSTEM_METRICS_TTL, lambda: asyncio.to_thread(self._sample_system, now)
             )
         except Exception as e:
             logger.error(f"Error collecting system metrics: {e}")
             raise
     
-    async def check_api_health(self) -> List[APIHealthCheck]:
+    async def check_api_health(self, now: Optional[datetime] = None) -> List[APIHealthCheck]:
         """Check health of API endpoints"""
+        now = now or datetime.now()
+        return await self._cached("api_health", API_HEALTH_TTL, lambda: self._probe_api_health(now))
+    
+    async def check_ollama_health(self, now: Optional[datetime] = None) -> APIHealthCheck:
+        """Check Ollama service health"""
+        now = now or datetime.now()
+        return await self._cached("ollama_health", OLLAMA_HEALTH_TTL, lambda: self._probe_ollama_health(now))
+    
+    async def _probe_api_health(self, now: datetime) -> List[APIHealthCheck]:
+        """Request every API endpoint concurrently and classify its health"""
         endpoints = [
             "/health",
             "/api/v1/chat/completions",
@@ -125,71 +355,74 @@ class MonitoringService:
             "/api/v1/upload"
         ]
         
-        health_checks = []
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            for endpoint in endpoints:
-                try:
-                    start_time = time.time()
-                    
-                    if endpoint == "/api/v1/chat/completions":
-                        # Test with minimal payload
-                        response = await client.post(
-                            f"{self.api_base_url}{endpoint}",
-                            json={
-                                "messages": [{"role": "user", "content": "health check"}],
-                                "model": "auto",
-                                "max_tokens": 1
-                            }
-                        )
-                    else:
-                        response = await client.get(f"{self.api_base_url}{endpoint}")
-                    
-                    response_time = (time.time() - start_time) * 1000
-                    
-                    status = "healthy" if response.status_code < 400 else "unhealthy"
-                    if response.status_code >= 400 and response.status_code < 500:
-                        status = "degraded"
-                    
-                    health_checks.append(APIHealthCheck(
-                        endpoint=endpoint,
-                        status=status,
-                        response_time_ms=response_time,
-                        status_code=response.status_code,
-                        error_message=None,
-                        timestamp=datetime.now()
-                    ))
-                    
-                except Exception as e:
-                    health_checks.append(APIHealthCheck(
-                        endpoint=endpoint,
-                        status="unhealthy",
-                        response_time_ms=0.0,
-                        status_code=None,
-                        error_message=str(e),
-                        timestamp=datetime.now()
-                    ))
-        
-        return health_checks
+        client = await self._get_client()
+        # Total latency is the slowest endpoint rather than the sum of all of them
+        return list(await asyncio.gather(
+            *(self._check_endpoint(client, endpoint, now) for endpoint in endpoints)
+        ))
     
-    async def check_ollama_health(self) -> APIHealthCheck:
-        """Check Ollama service health"""
+    async def _check_endpoint(self, client: httpx.AsyncClient, endpoint: str,
+                              now: datetime) -> APIHealthCheck:
+        """Check a single API endpoint; never raises, so one failure cannot abort the gather"""
         try:
-            start_time = time.time()
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get("http://localhost:11434/api/tags")
-                response_time = (time.time() - start_time) * 1000
-                
-                status = "healthy" if response.status_code == 200 else "unhealthy"
-                
-                return APIHealthCheck(
-                    endpoint="ollama:/api/tags",
-                    status=status,
-                    response_time_ms=response_time,
-                    status_code=response.status_code,
-                    error_message=None,
-                    timestamp=datetime.now()
+            start_time = time.perf_counter()
+            
+            if endpoint == "/api/v1/chat/completions":
+                # Test with minimal payload
+                response = await client.post(
+                    f"{self.api_base_url}{endpoint}",
+                    json={
+                        "messages": [{"role": "user", "content": "health check"}],
+                        "model": "auto",
+                        "max_tokens": 1
+                    }
                 )
+            else:
+                response = await client.get(f"{self.api_base_url}{endpoint}")
+            
+            response_time = (time.perf_counter() - start_time) * 1000
+            
+            status = "healthy" if response.status_code < 400 else "unhealthy"
+            if response.status_code >= 400 and response.status_code < 500:
+                status = "degraded"
+            
+            return APIHealthCheck(
+                endpoint=endpoint,
+                status=status,
+                response_time_ms=response_time,
+                status_code=response.status_code,
+                error_message=None,
+                timestamp=now
+            )
+            
+        except Exception as e:
+            return APIHealthCheck(
+                endpoint=endpoint,
+                status="unhealthy",
+                response_time_ms=0.0,
+                status_code=None,
+                error_message=str(e),
+                timestamp=now
+            )
+    
+    async def _probe_ollama_health(self, now: datetime) -> APIHealthCheck:
+        """Request the Ollama tags endpoint and classify its health"""
+        try:
+            start_time = time.perf_counter()
+            client = await self._get_client()
+            response = await client.get("http://localhost:11434/api/tags", timeout=5.0)
+            response_time = (time.perf_counter() - start_time) * 1000
+            
+            status = "healthy" if response.status_code == 200 else "unhealthy"
+            
+            return APIHealthCheck(
+                endpoint="ollama:/api/tags",
+                status=status,
+                response_time_ms=response_time,
+                status_code=response.status_code,
+                error_message=None,
+                timestamp=now
+            )
         except Exception as e:
             return APIHealthCheck(
                 endpoint="ollama:/api/tags",
@@ -197,85 +430,102 @@ class MonitoringService:
                 response_time_ms=0.0,
                 status_code=None,
                 error_message=str(e),
-                timestamp=datetime.now()
+                timestamp=now
             )
     
     async def save_metrics(self, data: Dict):
-        """Save metrics to file"""
+        """Append one sample to the history file, trimming old entries once an hour"""
         try:
-            # Keep only last 24 hours of metrics
-            if self.metrics_file.exists():
-                async with aiofiles.open(self.metrics_file, 'r') as f:
-                    existing_data = json.loads(await f.read())
-                
-                # Filter old entries
-                cutoff_time = datetime.now() - timedelta(hours=24)
-                existing_data = [
-                    entry for entry in existing_data 
-                    if datetime.fromisoformat(entry['timestamp']) > cutoff_time
-                ]
-                data['history'] = existing_data
+            async with aiofiles.open(self.metrics_file, 'ab') as f:
+                await f.write(_json_encode(data) + b'\n')
             
-            async with aiofiles.open(self.metrics_file, 'w') as f:
-                await f.write(json.dumps(data, default=str, indent=2))
+            if time.monotonic() - self._last_rotate >= HISTORY_ROTATE_INTERVAL:
+                await self._rotate()
                 
         except Exception as e:
             logger.error(f"Error saving metrics: {e}")
     
+    async def _rotate(self):
+        """Drop history entries older than the retention window off the event loop"""
+        self._last_rotate = time.monotonic()
+        cutoff = (datetime.now() - HISTORY_RETENTION).isoformat()
+        await asyncio.to_thread(self._rewrite_history_sync, cutoff)
+    
+    def _rewrite_history_sync(self, cutoff: str):
+        """Read the history once, keep entries newer than cutoff and swap the file atomically"""
+        if not self.metrics_file.exists():
+            return
+        
+        with open(self.metrics_file, 'rb') as f:
+            lines = f.read().splitlines(keepends=True)
+        kept = [line for line in lines if line.strip() and _entry_timestamp(line) > cutoff]
+        
+        tmp_file = self.metrics_file.with_suffix(".jsonl.tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(b''.join(kept))
+        os.replace(tmp_file, self.metrics_file)
+    
+    async def sample_all(self) -> SampleBundle:
+        """Collect system metrics and every health check once, concurrently, and derive alerts"""
+        # One timestamp for everything collected in this pass
+        now = datetime.now()
+        system_metrics, api_health, ollama_health = await asyncio.gather(
+            self.get_system_metrics(now),
+            self.check_api_health(now),
+            self.check_ollama_health(now)
+        )
+        return SampleBundle(
+            timestamp=now,
+            system=system_metrics,
+            api_health=api_health,
+            ollama_health=ollama_health,
+            alerts=self._compute_alerts(system_metrics, api_health, now)
+        )
+    
     async def get_alerts(self) -> List[Dict]:
         """Check for alert conditions"""
-        alerts = []
-        
+        now = datetime.now()
         try:
-            metrics = await self.get_system_metrics()
-            
-            # CPU alert
-            if metrics.cpu_percent > 80:
-                alerts.append({
-                    "type": "cpu_high",
-                    "severity": "warning" if metrics.cpu_percent < 90 else "critical",
-                    "message": f"CPU usage is {metrics.cpu_percent:.1f}%",
-                    "timestamp": datetime.now()
-                })
-            
-            # Memory alert
-            if metrics.memory_percent > 85:
-                alerts.append({
-                    "type": "memory_high",
-                    "severity": "warning" if metrics.memory_percent < 95 else "critical",
-                    "message": f"Memory usage is {metrics.memory_percent:.1f}%",
-                    "timestamp": datetime.now()
-                })
-            
-            # Disk space alert
-            if metrics.disk_usage_percent > 85:
-                alerts.append({
-                    "type": "disk_full",
-                    "severity": "warning" if metrics.disk_usage_percent < 95 else "critical",
-                    "message": f"Disk usage is {metrics.disk_usage_percent:.1f}%",
-                    "timestamp": datetime.now()
-                })
-            
-            # Check API health
-            health_checks = await self.check_api_health()
-            unhealthy_apis = [hc for hc in health_checks if hc.status == "unhealthy"]
-            
-            if unhealthy_apis:
-                alerts.append({
-                    "type": "api_unhealthy",
-                    "severity": "critical",
-                    "message": f"{len(unhealthy_apis)} API endpoints are unhealthy",
-                    "endpoints": [api.endpoint for api in unhealthy_apis],
-                    "timestamp": datetime.now()
-                })
-            
+            metrics, health_checks = await asyncio.gather(
+                self.get_system_metrics(now),
+                self.check_api_health(now)
+            )
         except Exception as e:
             logger.error(f"Error checking alerts: {e}")
-            alerts.append({
+            return [{
                 "type": "monitoring_error",
                 "severity": "warning",
                 "message": f"Error in monitoring system: {str(e)}",
-                "timestamp": datetime.now()
+                "timestamp": now
+            }]
+        
+        return self._compute_alerts(metrics, health_checks, now)
+    
+    def _compute_alerts(self, metrics: SystemMetrics, health_checks: List[APIHealthCheck],
+                        now: datetime) -> List[Dict]:
+        """Derive alerts from already-collected samples, stamped with the pass timestamp"""
+        alerts = []
+        
+        # Resource alerts
+        for alert_type, field, warning, critical in self.THRESHOLDS:
+            value = getattr(metrics, field)
+            if value > warning:
+                alerts.append({
+                    "type": alert_type,
+                    "severity": "critical" if value >= critical else "warning",
+                    "message": ALERT_MESSAGES[alert_type].format(value),
+                    "timestamp": now
+                })
+        
+        # API health alert
+        unhealthy_apis = [hc for hc in health_checks if hc.status == "unhealthy"]
+        if unhealthy_apis:
+            alerts.append({
+                "type": "api_unhealthy",
+                "severity": "critical",
+                "message": f"{len(unhealthy_apis)} API endpoints are unhealthy",
+                "endpoints": [api.endpoint for api in unhealthy_apis],
+                "timestamp": now
             })
         
         return alerts
@@ -289,10 +539,10 @@ monitoring_service = MonitoringService()
 async def get_monitoring_health():
     """Get overall system health status"""
     try:
-        system_metrics = await monitoring_service.get_system_metrics()
-        api_health = await monitoring_service.check_api_health()
-        ollama_health = await monitoring_service.check_ollama_health()
-        alerts = await monitoring_service.get_alerts()
+        sample = await monitoring_service.sample_all()
+        system_metrics, api_health, ollama_health, alerts = (
+            sample.system, sample.api_health, sample.ollama_health, sample.alerts
+        )
         
         # Determine overall status
         critical_alerts = [a for a in alerts if a.get("severity") == "critical"]
@@ -307,7 +557,7 @@ async def get_monitoring_health():
         
         return {
             "status": overall_status,
-            "timestamp": datetime.now(),
+            "timestamp": sample.timestamp,
             "system": system_metrics,
             "api_health": api_health,
             "ollama_health": ollama_health,
@@ -342,6 +592,23 @@ async def get_alerts():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/deep")
+async def get_deep_metrics():
+    """Get per-connection network details (expensive: walks every socket and process)"""
+    try:
+        connections = await asyncio.to_thread(psutil.net_connections, kind='inet')
+        by_status: Dict[str, int] = {}
+        for conn in connections:
+            by_status[conn.status] = by_status.get(conn.status, 0) + 1
+        return {
+            "timestamp": datetime.now(),
+            "network_connections": len(connections),
+            "connections_by_status": by_status
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/history")
 async def get_metrics_history():
     """Get historical metrics data"""
@@ -349,9 +616,14 @@ async def get_metrics_history():
         if not monitoring_service.metrics_file.exists():
             return {"history": []}
         
-        async with aiofiles.open(monitoring_service.metrics_file, 'r') as f:
-            data = json.loads(await f.read())
-            return data
+        # Only lines inside the retention window are parsed
+        cutoff = (datetime.now() - HISTORY_RETENTION).isoformat()
+        history = []
+        async with aiofiles.open(monitoring_service.metrics_file, 'rb') as f:
+            async for line in f:
+                if line.strip() and _entry_timestamp(line) > cutoff:
+                    history.append(_json_loads(line))
+        return {"history": history}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -360,20 +632,24 @@ async def monitoring_loop():
     """Background monitoring loop"""
     logger.info("Starting monitoring loop...")
     
+    # Ticks are scheduled from a fixed origin so sampling time does not add drift
+    loop = asyncio.get_running_loop()
+    next_tick = loop.time()
+    
     while True:
         try:
-            # Collect all metrics
-            system_metrics = await monitoring_service.get_system_metrics()
-            api_health = await monitoring_service.check_api_health()
-            ollama_health = await monitoring_service.check_ollama_health()
-            alerts = await monitoring_service.get_alerts()
+            # Collect all metrics in one pass
+            sample = await monitoring_service.sample_all()
+            system_metrics, api_health, ollama_health, alerts = (
+                sample.system, sample.api_health, sample.ollama_health, sample.alerts
+            )
             
             # Save metrics
             metrics_data = {
-                "timestamp": datetime.now().isoformat(),
-                "system": system_metrics.dict(),
-                "api_health": [h.dict() for h in api_health],
-                "ollama_health": ollama_health.dict(),
+                "timestamp": sample.timestamp.isoformat(),
+                "system": system_metrics.model_dump(mode='json'),
+                "api_health": _health_checks_adapter.dump_python(api_health, mode='json'),
+                "ollama_health": ollama_health.model_dump(mode='json'),
                 "alerts": alerts
             }
             
@@ -395,8 +671,15 @@ async def monitoring_loop():
         except Exception as e:
             logger.error(f"Error in monitoring loop: {e}")
         
-        # Wait for next check
-        await asyncio.sleep(monitoring_service.check_interval)
+        # Wait for next check, skipping any ticks the sample overran
+        interval = monitoring_service.check_interval
+        next_tick += interval
+        now = loop.time()
+        if now > next_tick:
+            missed = int((now - next_tick) // interval) + 1
+            logger.warning(f"Monitoring overrun by {now - next_tick:.1f}s, skipping {missed} tick(s)")
+            next_tick += missed * interval
+        await asyncio.sleep(next_tick - now)
 
 
 if __name__ == "__main__":
@@ -2,16 +2,25 @@ import PyPDF2
 from PIL import Image
 from docx import Document
 import openpyxl
+import asyncio
 import logging
 import mimetypes
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import json
 import io
 import base64
 
 logger = logging.getLogger(__name__)
 
+# Number of processed results kept per FileProcessor, keyed by (path, mtime, size)
+RESULT_CACHE_SIZE = 512
+
+# Length of the text preview stored with each result for search context
+TEXT_PREVIEW_CHARS = 500
+
 class FileProcessorError(Exception):
     """Custom exception for file processing errors"""
     pass
@@ -36,6 +45,8 @@ class FileProcessor:
             'text/csv': self.process_csv,
             'application/json': self.process_json
         }
+        self._result_cache: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     def get_file_type(self, file_path: Path) -> str:
         """
@@ -73,9 +84,60 @@ class FileProcessor:
         file_type = self.get_file_type(file_path)
         return file_type in self.supported_types
     
+    def _cache_key(self, file_path: Path) -> Optional[Tuple[str, int, int]]:
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+        return (str(file_path), stat.st_mtime_ns, stat.st_size)
+    
+    def _get_cached(self, key: Optional[Tuple[str, int, int]]) -> Optional[Dict[str, Any]]:
+        if key is None:
+            return None
+        with self._cache_lock:
+            result = self._result_cache.get(key)
+            if result is not None:
+                self._result_cache.move_to_end(key)
+            return result
+    
+    def _store_cached(self, key: Optional[Tuple[str, int, int]], result: Dict[str, Any]):
+        # Errors are not cached so a transient failure can be retried
+        if key is None or result['processing_status'] != 'success':
+            return
+        with self._cache_lock:
+            self._result_cache[key] = result
+            if len(self._result_cache) > RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+    
     def process_file(self, file_path: Path) -> Dict[str, Any]:
         """
-        Process a file and extract content based on its type
+        Process a file and extract content based on its type.
+        Results for an unchanged file are served from cache and shared between
+        callers, so they must be treated as read-only.
+        """
+        key = self._cache_key(file_path)
+        result = self._get_cached(key)
+        if result is None:
+            result = self.extract_file(file_path)
+            self._store_cached(key, result)
+        return result
+    
+    async def process_file_async(self, file_path: Path, executor=None) -> Dict[str, Any]:
+        """
+        Like process_file, but a cache miss is extracted in the given executor
+        (e.g. a ProcessPoolExecutor) instead of blocking the event loop
+        """
+        key = self._cache_key(file_path)
+        result = self._get_cached(key)
+        if result is None:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(executor, _extract_in_worker, file_path)
+            self._store_cached(key, result)
+        return result
+    
+    def extract_file(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Extract content from a file without consulting the result cache
         """
         try:
             file_type = self.get_file_type(file_path)
@@ -98,7 +160,10 @@ class FileProcessor:
                 'file_size': stat.st_size,
                 'processed_at': stat.st_mtime,
                 'processing_status': 'success',
-                'content': content_data
+                'content': content_data,
+                # Search-context preview, sliced once here rather than on every request;
+                # kept beside 'content' so API responses built from it are unchanged
+                'text_preview': (content_data.get('text') or '')[:TEXT_PREVIEW_CHARS]
             }
             
             logger.info(f"Successfully processed {file_path.name} ({file_type})")
@@ -414,6 +479,18 @@ class FileProcessor:
         
         return summaries.get(file_type, f"Processed {file_type} file")
 
+# Per-process instance used by executor workers
+_worker_processor: Optional[FileProcessor] = None
+
+def _extract_in_worker(file_path: Path) -> Dict[str, Any]:
+    """
+    Executor entry point; module-level so it can be pickled to worker processes
+    """
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = FileProcessor()
+    return _worker_processor.extract_file(file_path)
+
 # Convenience function
 def process_file(file_path: Path) -> Dict[str, Any]:
     """
@@ -3,10 +3,13 @@ import logging
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 from services.search_service import SearchService, SearchResult
-from processors.file_processor import FileProcessor
+from processors.file_processor import FileProcessor, TEXT_PREVIEW_CHARS
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on search requests in flight from a single processor
+SEARCH_CONCURRENCY = 32
+
 class ConcurrentProcessor:
     """
     Service for concurrent processing of files and web search operations
@@ -15,6 +18,14 @@ class ConcurrentProcessor:
     def __init__(self, file_processor: FileProcessor = None, search_service: SearchService = None):
         self.file_processor = file_processor or FileProcessor()
         self.search_service = search_service or SearchService()
+        self.search_semaphore = asyncio.Semaphore(SEARCH_CONCURRENCY)
+    
+    async def _bounded_search(self, search_coro):
+        """
+        Await a search call while holding a slot of the shared search semaphore
+        """
+        async with self.search_semaphore:
+            return await search_coro
     
     async def process_with_search(self, file_paths: List[Path], query: str, num_results: int = 5) -> Dict[str, Any]:
         """
@@ -31,7 +42,7 @@ class ConcurrentProcessor:
         try:
             # Create tasks for concurrent execution
             file_tasks = [self._process_single_file(file_path) for file_path in file_paths]
-            search_task = self.search_service.search(query, num_results)
+            search_task = self._bounded_search(self.search_service.search(query, num_results))
             
             logger.info(f"Starting concurrent processing: {len(file_paths)} files + search for '{query}'")
             
@@ -102,6 +113,14 @@ class ConcurrentProcessor:
         Returns:
             Dictionary containing file processing results
         """
+        # File processing is blocking, so run it in a worker thread to let files
+        # (and the search) actually proceed in parallel
+        return await asyncio.to_thread(self._process_file_blocking, file_path)
+    
+    def _process_file_blocking(self, file_path: Path) -> Dict[str, Any]:
+        """
+        Synchronous body of _process_single_file
+        """
         try:
             # Check if file exists
             if not file_path.exists():
@@ -165,14 +184,16 @@ class ConcurrentProcessor:
                         **result
                     })
                     # Extract text content for context
-                    text_content = result.get('content', {}).get('text', '')
-                    if text_content:
-                        search_contexts.append(text_content[:500])  # First 500 chars
+                    text_preview = (result.get('content') or {}).get('text', '')[:TEXT_PREVIEW_CHARS]
+                    if text_preview:
+                        search_contexts.append(text_preview)  # First 500 chars
             
             # Perform context-enhanced searches concurrently
             if search_contexts:
                 search_tasks = [
-                    self.search_service.search_with_context(base_query, context, num_results)
+                    self._bounded_search(
+                        self.search_service.search_with_context(base_query, context, num_results)
+                    )
                     for context in search_contexts
                 ]
                 search_results = await asyncio.gather(*search_tasks, return_exceptions=True)
@@ -225,31 +246,34 @@ class ConcurrentProcessor:
         try:
             all_results = []
             
-            # Process files in batches
-            for i in range(0, len(file_paths), batch_size):
-                batch_paths = file_paths[i:i + batch_size]
-                logger.info(f"Processing batch {i//batch_size + 1}: {len(batch_paths)} files")
-                
-                # Process current batch concurrently
-                batch_tasks = [self._process_single_file(file_path) for file_path in batch_paths]
-                batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-                
-                # Process batch results
-                for j, result in enumerate(batch_results):
-                    file_path = batch_paths[j]
-                    if isinstance(result, Exception):
-                        logger.error(f"File processing failed for {file_path}: {result}")
-                        all_results.append({
-                            "file_path": str(file_path),
-                            "status": "error",
-                            "error": str(result)
-                        })
-                    else:
-                        all_results.append({
-                            "file_path": str(file_path),
-                            "status": "success",
-                            **result
-                        })
+            # Keep at most batch_size files in flight; a sliding window avoids
+            # waiting on the slowest file of each fixed batch
+            semaphore = asyncio.Semaphore(max(1, batch_size))
+            
+            async def process_bounded(file_path: Path) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self._process_single_file(file_path)
+            
+            logger.info(f"Processing {len(file_paths)} files, up to {batch_size} at a time")
+            results = await asyncio.gather(
+                *(process_bounded(file_path) for file_path in file_paths),
+                return_exceptions=True
+            )
+            
+            for file_path, result in zip(file_paths, results):
+                if isinstance(result, Exception):
+                    logger.error(f"File processing failed for {file_path}: {result}")
+                    all_results.append({
+                        "file_path": str(file_path),
+                        "status": "error",
+                        "error": str(result)
+                    })
+                else:
+                    all_results.append({
+                        "file_path": str(file_path),
+                        "status": "success",
+                        **result
+                    })
             
             logger.info(f"Batch processing completed: {len(all_results)} files processed")
             return all_results
@@ -0,0 +1,213 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+# Optional Redis for the shared second tier
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+DEFAULT_TTL = 4 * 60 * 60  # 4 hours
+SEARCH_TTL = 60 * 60  # 1 hour
+
+
+class CacheBackend(Protocol):
+    """
+    Minimal async key/value interface shared by the cache tiers
+    """
+    async def get(self, key: str) -> Optional[Any]: ...
+    async def set(self, key: str, value: Any, ttl: int = DEFAULT_TTL) -> None: ...
+    async def delete(self, key: str) -> None: ...
+
+
+class MemoryBackend:
+    """
+    In-process LRU cache with per-entry expiry
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int = DEFAULT_TTL) -> None:
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Redis-backed cache tier shared between worker processes
+    """
+
+    def __init__(self, redis_url: str, max_connections: int = 50):
+        pool = redis.ConnectionPool.from_url(redis_url, max_connections=max_connections)
+        self.client = redis.Redis(connection_pool=pool)
+
+    async def ping(self) -> bool:
+        try:
+            return bool(await self.client.ping())
+        except Exception as e:
+            logger.warning(f"Redis cache not reachable: {e}")
+            return False
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            value = await self.client.get(key)
+        except Exception as e:
+            logger.warning(f"Redis cache get error: {e}")
+            return None
+        return json.loads(value) if value else None
+
+    async def set(self, key: str, value: Any, ttl: int = DEFAULT_TTL) -> None:
+        try:
+            await self.client.setex(key, ttl, json.dumps(value))
+        except Exception as e:
+            logger.warning(f"Redis cache set error: {e}")
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.client.delete(key)
+        except Exception as e:
+            logger.warning(f"Redis cache delete error: {e}")
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+class TwoTierCache:
+    """
+    In-process LRU (L1) in front of an optional Redis tier (L2)
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, maxsize: int = 1024, ttl: int = DEFAULT_TTL):
+        self.ttl = ttl
+        self.l1 = MemoryBackend(maxsize=maxsize)
+        self.l2: Optional[RedisBackend] = None
+        self.redis_url = redis_url
+        self.stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0, "sets": 0}
+
+    async def connect(self):
+        """
+        Attach the Redis tier if it is configured and reachable
+        """
+        if not (self.redis_url and REDIS_AVAILABLE):
+            return
+        backend = RedisBackend(self.redis_url)
+        if await backend.ping():
+            self.l2 = backend
+            logger.info("Cache using Redis second tier")
+        else:
+            await backend.aclose()
+
+    def share_redis(self, other: "TwoTierCache"):
+        """
+        Reuse another cache's Redis tier instead of opening a second pool
+        """
+        self.l2 = other.l2
+
+    async def aclose(self):
+        if self.l2 is not None:
+            await self.l2.aclose()
+            self.l2 = None
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.l1.get(key)
+        if value is not None:
+            self.stats["l1_hits"] += 1
+            return value
+
+        if self.l2 is not None:
+            value = await self.l2.get(key)
+            if value is not None:
+                self.stats["l2_hits"] += 1
+                await self.l1.set(key, value, self.ttl)
+                return value
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Any) -> None:
+        await self.l1.set(key, value, self.ttl)
+        if self.l2 is not None:
+            await self.l2.set(key, value, self.ttl)
+        self.stats["sets"] += 1
+
+    async def delete(self, key: str) -> None:
+        await self.l1.delete(key)
+        if self.l2 is not None:
+            await self.l2.delete(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.stats["l1_hits"] + self.stats["l2_hits"]
+        total = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate_percent": round(hits / total * 100, 2) if total else 0,
+            "l1_size": len(self.l1),
+            "l2_enabled": self.l2 is not None
+        }
+
+
+class LLMCache(TwoTierCache):
+    """
+    Cache for deterministic chat completions
+    """
+
+    @staticmethod
+    def make_key(model: Optional[str], messages: list, temperature: Optional[float],
+                 max_tokens: Optional[int]) -> str:
+        """
+        Build a stable cache key from the fields that determine the completion
+        """
+        raw = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True
+        )
+        return "llm:" + hashlib.sha256(raw.encode()).hexdigest()
+
+
+class SearchCache(TwoTierCache):
+    """
+    Cache for web search results keyed by the normalized query
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: int = SEARCH_TTL):
+        super().__init__(redis_url=None, maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def make_key(query: str, engines: Optional[List[str]], num_results: Optional[int],
+                 context: Optional[str] = None) -> str:
+        """
+        Build a cache key from the normalized query, engines, result count and
+        optional file context
+        """
+        raw = f"{query.strip().lower()}|{','.join(sorted(engines or []))}|{num_results}"
+        if context:
+            raw += "|" + hashlib.sha256(context.encode()).hexdigest()
+        return "search:" + hashlib.sha256(raw.encode()).hexdigest()
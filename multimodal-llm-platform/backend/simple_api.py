@@ -28,7 +28,7 @@ from contextlib import asynccontextmanager
 import re
 
 # Import monitoring, security, and logging
-from monitoring import router as monitoring_router, monitoring_loop
+from monitoring import router as monitoring_router, monitoring_loop, monitoring_service
 from security import (
     SecurityManager, RateLimitMiddleware, SecurityHeadersMiddleware,
     get_optional_user, validate_api_key, secure_filename,
@@ -69,6 +69,9 @@ async def lifespan(app: FastAPI):
         await health_logging_task
     except asyncio.CancelledError:
         pass
+    await enhanced_router.aclose()
+    await monitoring_service.close()
+    content_summarizer.close()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -347,7 +350,7 @@ async def stream_ollama_response(payload: Dict[str, Any]) -> AsyncGenerator[str,
 async def stream_enhanced_response(model_id: str, messages: List[Dict], **kwargs) -> AsyncGenerator[str, None]:
     """Stream response using enhanced model router"""
     try:
-        async for chunk in enhanced_router.make_api_call(model_id, messages, stream=True, **kwargs):
+        async for chunk in await enhanced_router.make_api_call(model_id, messages, stream=True, **kwargs):
             yield f"data: {chunk}\n\n"
         
         yield "data: [DONE]\n\n"
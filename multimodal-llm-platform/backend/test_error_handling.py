@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for the app-wide error handling
+"""
+
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+import main as api
+
+ORIGIN = "http://localhost:3000"
+
+@api.app.get("/__test__/boom")
+async def boom():
+    raise ValueError("boom")
+
+def test_unhandled_error_keeps_cors():
+    """Unexpected errors are 500 JSON responses that the frontends can read"""
+    print("=== Testing Unhandled Error Response ===")
+    
+    client = TestClient(api.app, raise_server_exceptions=False)
+    response = client.get("/__test__/boom", headers={"Origin": ORIGIN})
+    print(f"Status: {response.status_code}, body: {response.text}")
+    print(f"Access-Control-Allow-Origin: {response.headers.get('access-control-allow-origin')}")
+    assert response.status_code == 500
+    assert response.json() == {"detail": "boom"}
+    assert response.headers.get("access-control-allow-origin") == ORIGIN
+    
+    print()
+
+def test_http_error_keeps_cors():
+    """HTTPExceptions keep FastAPI's default handling and CORS headers"""
+    print("=== Testing HTTP Error Response ===")
+    
+    client = TestClient(api.app, raise_server_exceptions=False)
+    response = client.get("/__test__/missing", headers={"Origin": ORIGIN})
+    assert response.status_code == 404
+    assert response.headers.get("access-control-allow-origin") == ORIGIN
+    
+    print()
+
+def main():
+    """Run all tests"""
+    print("🧪 Error Handling Test Suite")
+    print("=" * 50)
+    
+    try:
+        test_unhandled_error_keeps_cors()
+        test_http_error_keeps_cors()
+        
+        print("✅ All tests completed successfully!")
+        
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    main()
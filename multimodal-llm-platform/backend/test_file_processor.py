@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test script for the FileProcessor result cache
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+import processors.file_processor as file_processor_module
+from processors.file_processor import FileProcessor, TEXT_PREVIEW_CHARS
+
+def write_file(path: Path, text: str, mtime_ns: int):
+    """Write text and pin the mtime so cache keys are deterministic"""
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def test_result_cache_hit():
+    """An unchanged file is served from cache without re-extraction"""
+    print("=== Testing Result Cache Hit ===")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "notes.txt"
+        write_file(path, "hello world", 1_000_000_000)
+        
+        processor = FileProcessor()
+        first = processor.process_file(path)
+        second = processor.process_file(path)
+        assert first['processing_status'] == 'success'
+        assert second is first
+        assert len(processor._result_cache) == 1
+        
+        # The preview sits next to the content, not inside it
+        assert first['text_preview'] == "hello world"[:TEXT_PREVIEW_CHARS]
+        assert 'text_preview' not in first['content']
+        
+    print()
+
+def test_result_cache_invalidation():
+    """A new mtime or size produces a new cache entry"""
+    print("=== Testing Result Cache Invalidation ===")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "notes.txt"
+        write_file(path, "version one", 1_000_000_000)
+        
+        processor = FileProcessor()
+        first = processor.process_file(path)
+        
+        # Same size, newer mtime
+        write_file(path, "version two", 2_000_000_000)
+        second = processor.process_file(path)
+        assert second is not first
+        assert second['content']['text'] == "version two"
+        
+        # Same mtime, different size
+        write_file(path, "version three", 2_000_000_000)
+        third = processor.process_file(path)
+        assert third['content']['text'] == "version three"
+        assert len(processor._result_cache) == 3
+        
+    print()
+
+def test_result_cache_lru():
+    """The least recently used result is evicted past RESULT_CACHE_SIZE"""
+    print("=== Testing Result Cache LRU ===")
+    
+    original_size = file_processor_module.RESULT_CACHE_SIZE
+    file_processor_module.RESULT_CACHE_SIZE = 2
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [Path(tmp) / f"file{i}.txt" for i in range(3)]
+            for i, path in enumerate(paths):
+                write_file(path, f"file {i}", 1_000_000_000)
+            
+            processor = FileProcessor()
+            a = processor.process_file(paths[0])
+            processor.process_file(paths[1])
+            assert processor.process_file(paths[0]) is a  # paths[1] is now least recent
+            processor.process_file(paths[2])
+            
+            cached_paths = [key[0] for key in processor._result_cache]
+            print(f"Cached: {[Path(p).name for p in cached_paths]}")
+            assert cached_paths == [str(paths[0]), str(paths[2])]
+    finally:
+        file_processor_module.RESULT_CACHE_SIZE = original_size
+        
+    print()
+
+def test_errors_not_cached():
+    """Failed extractions are retried rather than served from cache"""
+    print("=== Testing Error Results ===")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "archive.bin"
+        write_file(path, "not a supported type", 1_000_000_000)
+        
+        processor = FileProcessor()
+        result = processor.process_file(path)
+        assert result['processing_status'] == 'error'
+        assert len(processor._result_cache) == 0
+        
+    print()
+
+def main():
+    """Run all tests"""
+    print("🧪 File Processor Cache Test Suite")
+    print("=" * 50)
+    
+    try:
+        test_result_cache_hit()
+        test_result_cache_invalidation()
+        test_result_cache_lru()
+        test_errors_not_cached()
+        
+        print("✅ All tests completed successfully!")
+        
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test script for the chat completion and search caches
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from services.llm_cache import LLMCache, MemoryBackend, TwoTierCache
+
+MESSAGES = [{"role": "user", "content": "What is the capital of France?"}]
+
+def test_llm_cache_key():
+    """Keys depend on every completion-determining field and nothing else"""
+    print("=== Testing LLM Cache Keys ===")
+    
+    key = LLMCache.make_key("gpt-4o", MESSAGES, 0.0, 100)
+    print(f"Key: {key}")
+    assert key.startswith("llm:")
+    
+    # Same request, dict keys in a different order
+    reordered = [{"content": "What is the capital of France?", "role": "user"}]
+    assert LLMCache.make_key("gpt-4o", reordered, 0.0, 100) == key
+    
+    # Any field that changes the completion changes the key
+    assert LLMCache.make_key("gpt-4o-mini", MESSAGES, 0.0, 100) != key
+    assert LLMCache.make_key("gpt-4o", MESSAGES, 0.7, 100) != key
+    assert LLMCache.make_key("gpt-4o", MESSAGES, 0.0, 200) != key
+    assert LLMCache.make_key("gpt-4o", MESSAGES + [{"role": "user", "content": "And Spain?"}], 0.0, 100) != key
+    
+    print()
+
+def test_memory_backend_ttl():
+    """Entries expire after their TTL"""
+    print("=== Testing Memory Backend TTL ===")
+    
+    async def run():
+        backend = MemoryBackend(maxsize=8)
+        await backend.set("short", "value", ttl=0.05)
+        await backend.set("long", "value", ttl=60)
+        assert await backend.get("short") == "value"
+        
+        await asyncio.sleep(0.1)
+        assert await backend.get("short") is None
+        assert await backend.get("long") == "value"
+        # Expired entries are dropped on read
+        assert len(backend) == 1
+        
+    asyncio.run(run())
+    print()
+
+def test_memory_backend_lru():
+    """The least recently used entry is evicted past maxsize"""
+    print("=== Testing Memory Backend LRU ===")
+    
+    async def run():
+        backend = MemoryBackend(maxsize=2)
+        await backend.set("a", 1)
+        await backend.set("b", 2)
+        await backend.get("a")  # "b" is now the least recently used
+        await backend.set("c", 3)
+        
+        assert await backend.get("a") == 1
+        assert await backend.get("b") is None
+        assert await backend.get("c") == 3
+        
+    asyncio.run(run())
+    print()
+
+def test_two_tier_cache_stats():
+    """Hits, misses and sets are counted; without Redis the cache stays in memory"""
+    print("=== Testing Two-Tier Cache ===")
+    
+    async def run():
+        cache = TwoTierCache(redis_url=None, maxsize=4, ttl=60)
+        await cache.connect()
+        
+        key = LLMCache.make_key("gpt-4o", MESSAGES, 0.0, 100)
+        assert await cache.get(key) is None
+        await cache.set(key, {"content": "Paris"})
+        assert await cache.get(key) == {"content": "Paris"}
+        
+        stats = cache.get_stats()
+        print(f"Stats: {stats}")
+        assert stats["l1_hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["sets"] == 1
+        assert stats["hit_rate_percent"] == 50.0
+        assert stats["l2_enabled"] is False
+        
+        await cache.delete(key)
+        assert await cache.get(key) is None
+        
+    asyncio.run(run())
+    print()
+
+def test_two_tier_cache_ttl():
+    """The cache-wide TTL applies to every entry"""
+    print("=== Testing Two-Tier Cache TTL ===")
+    
+    async def run():
+        cache = TwoTierCache(redis_url=None, ttl=0.05)
+        await cache.set("key", "value")
+        assert await cache.get("key") == "value"
+        time.sleep(0.1)
+        assert await cache.get("key") is None
+        
+    asyncio.run(run())
+    print()
+
+def main():
+    """Run all tests"""
+    print("🧪 LLM Cache Test Suite")
+    print("=" * 50)
+    
+    try:
+        test_llm_cache_key()
+        test_memory_backend_ttl()
+        test_memory_backend_lru()
+        test_two_tier_cache_stats()
+        test_two_tier_cache_ttl()
+        
+        print("✅ All tests completed successfully!")
+        
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    main()
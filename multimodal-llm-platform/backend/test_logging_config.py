@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for the queue-based logging setup
+"""
+
+import json
+import logging
+import sys
+import uuid
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+import logging_config
+
+def flush_log_queue():
+    """Drain the queue listener so the log files are complete"""
+    listener = logging_config._queue_listener
+    listener.stop()
+    listener.start()
+
+def test_exception_keeps_exc_info():
+    """logger.exception() records reach errors.log with their exc_info field"""
+    print("=== Testing Exception Logging ===")
+    
+    marker = f"queue exc_info check {uuid.uuid4().hex}"
+    logger = logging.getLogger("autopicker.tests")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception(marker)
+    flush_log_queue()
+    
+    lines = (logging_config.LOG_DIR / "errors.log").read_text().splitlines()
+    matching = [line for line in lines if marker in line]
+    print(f"Matching errors.log lines: {len(matching)}")
+    assert len(matching) == 1
+    
+    if isinstance(logging_config._queue_listener.handlers[0].formatter, logging_config.CustomJSONFormatter):
+        entry = json.loads(matching[0])
+        print(f"Logged fields: {sorted(entry)}")
+        assert entry["message"] == marker
+        assert "ValueError: boom" in entry["exc_info"]
+    
+    print()
+
+def test_message_args_frozen():
+    """Arguments are interpolated when the record is queued, not when it is written"""
+    print("=== Testing Message Formatting ===")
+    
+    marker = f"queue args check {uuid.uuid4().hex}"
+    items = ["before"]
+    logging.getLogger("autopicker.tests").error("%s %s", marker, items)
+    items[0] = "after"
+    flush_log_queue()
+    
+    lines = (logging_config.LOG_DIR / "errors.log").read_text().splitlines()
+    matching = [line for line in lines if marker in line]
+    assert len(matching) == 1
+    assert "before" in matching[0] and "after" not in matching[0]
+    
+    print()
+
+def main():
+    """Run all tests"""
+    print("🧪 Logging Test Suite")
+    print("=" * 50)
+    
+    try:
+        test_exception_keeps_exc_info()
+        test_message_args_frozen()
+        
+        print("✅ All tests completed successfully!")
+        
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    main()
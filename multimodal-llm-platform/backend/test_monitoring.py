@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test script for the /proc-based system metrics
+"""
+
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+import monitoring
+
+MEMINFO = b"""MemTotal:       16384000 kB
+MemFree:         1024000 kB
+MemAvailable:    8192000 kB
+Buffers:          512000 kB
+"""
+
+STAT = b"""cpu  100 5 50 800 40 3 2 0 7 0
+cpu0 50 2 25 400 20 1 1 0 3 0
+intr 12345
+"""
+
+SOCKSTAT = b"""sockets: used 321
+TCP: inuse 10 orphan 0 tw 4 alloc 12 mem 2
+UDP: inuse 3 mem 1
+UDPLITE: inuse 0
+RAW: inuse 0
+FRAG: inuse 0 memory 0
+"""
+
+SOCKSTAT6 = b"""TCP6: inuse 5
+UDP6: inuse 2
+UDPLITE6: inuse 0
+RAW6: inuse 1
+FRAG6: inuse 0 memory 0
+"""
+
+def fake_proc(files):
+    """Stand-in for _read_proc that serves the given path -> bytes mapping"""
+    def read(path, size=8192):
+        if path not in files:
+            raise FileNotFoundError(path)
+        return files[path][:size]
+    return read
+
+def with_proc(files, check):
+    """Run check() with /proc reads served from files"""
+    original = monitoring._read_proc
+    monitoring._read_proc = fake_proc(files)
+    try:
+        return check()
+    finally:
+        monitoring._read_proc = original
+
+def test_read_meminfo():
+    """MemTotal and MemAvailable are read in bytes"""
+    print("=== Testing /proc/meminfo ===")
+    
+    total, available = with_proc({"/proc/meminfo": MEMINFO}, monitoring._read_meminfo)
+    print(f"Total: {total}, available: {available}")
+    assert total == 16384000 * 1024
+    assert available == 8192000 * 1024
+    
+    print()
+
+def test_read_cpu_times():
+    """Idle includes iowait; guest time is already counted in user and is excluded"""
+    print("=== Testing /proc/stat ===")
+    
+    idle, total = with_proc({"/proc/stat": STAT}, monitoring._read_cpu_times)
+    print(f"Idle: {idle}, total: {total}")
+    assert idle == 800 + 40
+    assert total == 100 + 5 + 50 + 800 + 40 + 3 + 2 + 0
+    
+    print()
+
+def test_count_inet_sockets():
+    """Only TCP/UDP in-use counts from both sockstat files are summed"""
+    print("=== Testing /proc/net/sockstat ===")
+    
+    if not monitoring.IS_LINUX:
+        print("Skipped: sockstat is only read on Linux")
+        return
+    
+    files = {"/proc/net/sockstat": SOCKSTAT, "/proc/net/sockstat6": SOCKSTAT6}
+    count = with_proc(files, monitoring._count_inet_sockets)
+    print(f"Sockets: {count}")
+    assert count == 10 + 3 + 5 + 2
+    
+    # A missing sockstat6 (IPv6 disabled) is not an error
+    count = with_proc({"/proc/net/sockstat": SOCKSTAT}, monitoring._count_inet_sockets)
+    assert count == 10 + 3
+    
+    print()
+
+def test_proc_cpu_percent():
+    """CPU usage is the busy share of the jiffies elapsed since the last snapshot"""
+    print("=== Testing CPU Percent ===")
+    
+    service = monitoring.MonitoringService()
+    service._cpu_snapshot = (840, 1000)
+    later = b"cpu  150 5 70 950 40 3 2 0 0 0\n"
+    percent = with_proc({"/proc/stat": later}, service._proc_cpu_percent)
+    print(f"CPU: {percent}%")
+    # 220 jiffies elapsed, 150 of them idle
+    assert percent == round(70 / 220 * 100, 1)
+    
+    # No elapsed jiffies reads as idle rather than dividing by zero
+    assert with_proc({"/proc/stat": later}, service._proc_cpu_percent) == 0.0
+    
+    print()
+
+def test_cpu_percent_min_interval():
+    """Readings closer together than MIN_CPU_SAMPLE_SECONDS repeat the last value"""
+    print("=== Testing CPU Sample Interval ===")
+    
+    service = monitoring.MonitoringService()
+    calls = []
+    def sample():
+        calls.append(1)
+        return 42.0
+    service._proc_cpu_percent = sample
+    service._use_proc = True
+    
+    # Straight after start-up the interval is too short to measure
+    assert service._cpu_percent() == 0.0
+    assert not calls
+    
+    service._cpu_sampled_at -= monitoring.MIN_CPU_SAMPLE_SECONDS
+    assert service._cpu_percent() == 42.0
+    assert len(calls) == 1
+    
+    # An immediate second reading reuses the last value and keeps the baseline
+    assert service._cpu_percent() == 42.0
+    assert len(calls) == 1
+    
+    print()
+
+def main():
+    """Run all tests"""
+    print("🧪 Monitoring Test Suite")
+    print("=" * 50)
+    
+    try:
+        test_read_meminfo()
+        test_read_cpu_times()
+        test_count_inet_sockets()
+        test_proc_cpu_percent()
+        test_cpu_percent_min_interval()
+        
+        print("✅ All tests completed successfully!")
+        
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    main()
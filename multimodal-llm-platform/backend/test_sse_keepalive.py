@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for SSE keep-alive pings on the chat stream
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add backend directory to path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+import main as api
+
+def collect(chunks, ping_interval=0.05):
+    """Run chunks through the keep-alive wrapper and return everything it yields"""
+    async def run():
+        return [chunk async for chunk in api._sse_with_keepalive(chunks)]
+    
+    original = api.SSE_PING_INTERVAL
+    api.SSE_PING_INTERVAL = ping_interval
+    try:
+        return asyncio.run(run())
+    finally:
+        api.SSE_PING_INTERVAL = original
+
+def test_passthrough():
+    """A stream with no idle gaps is passed through unchanged"""
+    print("=== Testing SSE Passthrough ===")
+    
+    async def upstream():
+        yield b'data: {"n": 1}\n\n'
+        yield b'data: {"n": 2}\n\n'
+        yield b"data: [DONE]\n\n"
+    
+    output = collect(upstream(), ping_interval=5)
+    assert output == [b'data: {"n": 1}\n\n', b'data: {"n": 2}\n\n', b"data: [DONE]\n\n"]
+    
+    print()
+
+def test_ping_on_idle():
+    """Idle gaps between events are filled with comment pings"""
+    print("=== Testing SSE Ping On Idle ===")
+    
+    async def upstream():
+        yield b'data: {"n": 1}\n\n'
+        await asyncio.sleep(0.18)
+        yield b"data: [DONE]\n\n"
+    
+    output = collect(upstream())
+    print(f"Output: {output}")
+    pings = output[1:-1]
+    assert output[0] == b'data: {"n": 1}\n\n'
+    assert output[-1] == b"data: [DONE]\n\n"
+    assert pings and all(chunk == api.SSE_PING for chunk in pings)
+    
+    # The stream still parses as complete SSE events
+    assert b"".join(output).endswith(b"\n\n")
+    
+    print()
+
+def test_no_ping_mid_event():
+    """A ping is never inserted into a partially sent event"""
+    print("=== Testing SSE Event Boundaries ===")
+    
+    async def upstream():
+        yield b'data: {"n": '
+        await asyncio.sleep(0.18)
+        yield b"1}\n\n"
+        await asyncio.sleep(0.18)
+        yield b"data: [DONE]\n\n"
+    
+    output = collect(upstream())
+    print(f"Output: {output}")
+    assert output[:2] == [b'data: {"n": ', b"1}\n\n"]
+    assert api.SSE_PING in output[2:-1]
+    
+    print()
+
+def test_upstream_closed_early():
+    """Closing the wrapper cancels the pending upstream read"""
+    print("=== Testing SSE Cancellation ===")
+    
+    cancelled = []
+    
+    async def upstream():
+        try:
+            yield b'data: {"n": 1}\n\n'
+            await asyncio.sleep(10)
+            yield b"data: [DONE]\n\n"
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+    
+    async def run():
+        stream = api._sse_with_keepalive(upstream())
+        assert await stream.__anext__() == b'data: {"n": 1}\n\n'
+        assert await stream.__anext__() == api.SSE_PING
+        await stream.aclose()
+    
+    original = api.SSE_PING_INTERVAL
+    api.SSE_PING_INTERVAL = 0.05
+    try:
+        asyncio.run(run())
+    finally:
+        api.SSE_PING_INTERVAL = original
+    assert cancelled
+    
+    print()
+
+def main():
+    """Run all tests"""
+    print("🧪 SSE Keep-Alive Test Suite")
+    print("=" * 50)
+    
+    try:
+        test_passthrough()
+        test_ping_on_idle()
+        test_no_ping_mid_event()
+        test_upstream_closed_early()
+        
+        print("✅ All tests completed successfully!")
+        
+    except Exception as e:
+        print(f"❌ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+
+if __name__ == "__main__":
+    main()
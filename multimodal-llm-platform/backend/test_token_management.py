@@ -3,6 +3,7 @@
 Test script for token management and chunking functionality
 """
 
+import re
 import sys
 from pathlib import Path
 import asyncio
@@ -12,7 +13,31 @@ backend_dir = Path(__file__).parent
 sys.path.insert(0, str(backend_dir))
 
 from token_manager import token_manager, ChunkingStrategy
-from content_summarizer import ContentSummarizer
+from content_summarizer import ContentSummarizer, SummarizationStrategy
+
+class PretokenCounter:
+    """Deterministic stand-in for a BPE encoder (no encoder download needed).
+    
+    Splits like GPT-style pre-tokenization: each word, number or punctuation run
+    is one token and carries its leading space, as in " The".
+    """
+    
+    _TOKEN_RE = re.compile(r" ?[A-Za-z]+| ?\d+| ?[^\sA-Za-z\d]+|\s+")
+    
+    def count_tokens(self, text, model_family="default"):
+        return len(self._TOKEN_RE.findall(text))
+    
+    def token_offsets(self, text, model_family="default"):
+        return [match.start() for match in self._TOKEN_RE.finditer(text)]
+
+BUDGET_PARAGRAPHS = [
+    "Artificial intelligence (AI) and machine learning (ML) have become critical technologies in modern software development. These technologies enable systems to learn from data, make predictions, and automate complex decision-making processes. It is important to evaluate different algorithms.",
+    "Natural Language Processing: AI systems can understand, interpret, and generate human language with increasing accuracy. Computer Vision: Machine learning algorithms can analyze visual information from images and videos. The key result is 42 percent better.",
+    "When implementing AI/ML solutions, developers must consider data quality, model selection, training requirements, and performance optimization. Why does this matter? The field continues to evolve rapidly with advances in deep learning."
+]
+BUDGET_DOCUMENT = "\n\n".join(
+    f"{BUDGET_PARAGRAPHS[i % 3]} Section {i} notes follow here." for i in range(30)
+)
 
 def test_token_counting():
     """Test basic token counting functionality"""
@@ -185,6 +210,57 @@ def test_batch_summarization():
     
     print()
 
+def test_span_token_counts():
+    """Sentence token counts from one tokenizer pass match counting each sentence"""
+    print("=== Testing Span Token Counts ===")
+    
+    counter = PretokenCounter()
+    summarizer = ContentSummarizer(counter)
+    spans, span_tokens = summarizer._tokenize_with_offsets(BUDGET_DOCUMENT, "default")
+    per_sentence = [counter.count_tokens(BUDGET_DOCUMENT[start:end]) for start, end in spans]
+    
+    print(f"Sentences: {len(spans)}")
+    print(f"Summed span tokens: {sum(span_tokens)}, per-sentence tokens: {sum(per_sentence)}")
+    assert span_tokens == per_sentence
+    
+    print()
+
+def test_summary_token_budget():
+    """Extractive and keyword-focused summaries stay within their target"""
+    print("=== Testing Summary Token Budget ===")
+    
+    counter = PretokenCounter()
+    for strategy in (SummarizationStrategy.EXTRACTIVE, SummarizationStrategy.KEYWORD_FOCUSED):
+        for target_tokens in (50, 200, 500):
+            summary = ContentSummarizer(counter).summarize_content(
+                content=BUDGET_DOCUMENT,
+                target_tokens=target_tokens,
+                strategy=strategy,
+                context_keywords=["AI"] if strategy == SummarizationStrategy.KEYWORD_FOCUSED else None
+            )
+            tokens = counter.count_tokens(summary.summarized_content)
+            print(f"{strategy.value} target {target_tokens}: {tokens} tokens")
+            assert 0 < tokens <= target_tokens
+    
+    print()
+
+def test_structural_token_budget():
+    """Structural summaries, separators included, stay within their target"""
+    print("=== Testing Structural Token Budget ===")
+    
+    counter = PretokenCounter()
+    for target_tokens in (50, 200, 500):
+        summary = ContentSummarizer(counter).summarize_content(
+            content=BUDGET_DOCUMENT,
+            target_tokens=target_tokens,
+            strategy=SummarizationStrategy.STRUCTURAL
+        )
+        tokens = counter.count_tokens(summary.summarized_content)
+        print(f"structural target {target_tokens}: {tokens} tokens")
+        assert 0 < tokens <= target_tokens
+    
+    print()
+
 def test_model_analysis():
     """Test model context analysis"""
     print("=== Testing Model Context Analysis ===")
@@ -214,6 +290,9 @@ def main():
         test_chunking()
         test_content_summarization()
         test_batch_summarization()
+        test_span_token_counts()
+        test_summary_token_budget()
+        test_structural_token_budget()
         test_model_analysis()
         
         print("✅ All tests completed successfully!")
@@ -11,6 +11,7 @@ from dataclasses import dataclass
 from enum import Enum
 import re
 import math
+from itertools import accumulate
 
 logger = logging.getLogger("autopicker.token_manager")
 
@@ -52,6 +53,7 @@ class TokenCounter:
     
     def __init__(self):
         self.encoders = {}
+        self._token_lengths = {}  # encoder name -> byte length of every token id
         self._load_encoders()
     
     def _load_encoders(self):
@@ -68,19 +70,22 @@ class TokenCounter:
             except Exception as e2:
                 logger.error(f"Could not load fallback encoder: {e2}")
     
-    def count_tokens(self, text: str, model_family: str = "default") -> int:
-        """Count tokens for given text and model family"""
-        if not text:
-            return 0
-            
-        # Choose appropriate encoder
+    def _get_encoder(self, model_family: str):
+        """Choose the encoder for a model family (None if nothing could be loaded)"""
         encoder_key = "default"
         if "gpt-4" in model_family.lower():
             encoder_key = "gpt-4"
         elif "gpt-3.5" in model_family.lower():
             encoder_key = "gpt-3.5"
         
-        encoder = self.encoders.get(encoder_key, self.encoders.get("default"))
+        return self.encoders.get(encoder_key, self.encoders.get("default"))
+    
+    def count_tokens(self, text: str, model_family: str = "default") -> int:
+        """Count tokens for given text and model family"""
+        if not text:
+            return 0
+            
+        encoder = self._get_encoder(model_family)
         if not encoder:
             # Rough estimation: ~4 characters per token
             return len(text) // 4
@@ -91,6 +96,58 @@ class TokenCounter:
             logger.warning(f"Token counting failed: {e}, using rough estimation")
             return len(text) // 4
     
+    def count_tokens_batch(self, texts: List[str], model_family: str = "default") -> List[int]:
+        """Count tokens for several texts with one batched tokenizer call"""
+        encoder = self._get_encoder(model_family)
+        if not encoder:
+            return [self.count_tokens(text, model_family) for text in texts]
+        
+        try:
+            return [len(tokens) for tokens in encoder.encode_batch(texts)]
+        except Exception as e:
+            logger.warning(f"Batch token counting failed: {e}, counting individually")
+            return [self.count_tokens(text, model_family) for text in texts]
+    
+    def token_offsets(self, text: str, model_family: str = "default") -> Optional[List[int]]:
+        """Tokenize text once and return the character offset each token starts at.
+        
+        Returns None when no encoder is available, so callers can fall back to
+        the ~4 characters per token estimation used by count_tokens.
+        """
+        if not text:
+            return []
+        
+        encoder = self._get_encoder(model_family)
+        if not encoder:
+            return None
+        
+        try:
+            tokens = encoder.encode(text)
+            if text.isascii():
+                # One byte per character, so each token starts at the running byte length
+                offsets = list(accumulate(map(self._token_byte_lengths(encoder).__getitem__, tokens)))
+                offsets.insert(0, 0)
+                offsets.pop()
+                return offsets
+            _, offsets = encoder.decode_with_offsets(tokens)
+            return offsets
+        except Exception as e:
+            logger.warning(f"Token offset calculation failed: {e}, using rough estimation")
+            return None
+    
+    def _token_byte_lengths(self, encoder) -> List[int]:
+        """Byte length of every token id in an encoder's vocabulary, built once per encoder"""
+        lengths = self._token_lengths.get(encoder.name)
+        if lengths is None:
+            lengths = []
+            for token in range(encoder.n_vocab):
+                try:
+                    lengths.append(len(encoder.decode_single_token_bytes(token)))
+                except KeyError:
+                    lengths.append(0)  # unused id
+            self._token_lengths[encoder.name] = lengths
+        return lengths
+    
     def count_messages_tokens(self, messages: List[Dict[str, str]], model_family: str = "default") -> int:
         """Count tokens for a list of messages (OpenAI format)"""
         total_tokens = 0